@@ -18,12 +18,26 @@ import os
 # 添加src目录到Python路径
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from app import app, init_csv_files
-
 if __name__ == '__main__':
+    import logging
+    logging.basicConfig(level=logging.INFO)
+
+    # 延迟到真正启动时再导入，避免作为模块被import时付出Flask/openai的导入成本
+    from app import app, init_csv_files
+
     # 初始化CSV文件
     init_csv_files()
 
+    # 预热AI服务连接 - 提前完成DNS解析和TLS握手，
+    # 首个用户请求就能直接复用连接池里的长连接
+    try:
+        from ai_service import ai_service
+        if ai_service is not None:
+            ai_service.client.models.list()
+            print("AI服务连接预热完成")
+    except Exception as e:
+        print(f"AI服务连接预热失败（不影响启动）: {e}")
+
     # 启动Flask应用
     print("=" * 50)
     print("Mini-Duolingo 正在启动...")
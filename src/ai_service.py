@@ -3,35 +3,392 @@ AI服务模块
 提供题目生成、答案解析、翻译等功能
 """
 
+import asyncio
+import hashlib
+import json
+import math
 import os
-from openai import OpenAI
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from functools import lru_cache, wraps
+
+from openai import (
+    OpenAI,
+    AsyncOpenAI,
+    Timeout,
+    RateLimitError,
+    APITimeoutError,
+    APIConnectionError,
+    DefaultHttpxClient,
+    DefaultAsyncHttpxClient,
+)
+from httpx import Limits
 from dotenv import load_dotenv
 
-# 加载环境变量 - 明确指定项目根目录的.env文件
+# JSON解析 - 优先使用orjson（原生实现，解析大响应快3-5倍），未安装时退回标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _json_loads(s):
+    """热路径上的JSON解析，优先走orjson"""
+    if _orjson is not None:
+        return _orjson.loads(s)
+    return json.loads(s)
+
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json_object(content):
+    """
+    从模型回复中提取第一个合法的JSON对象
+
+    从第一个'{'起用raw_decode单趟扫描，兼容裸JSON、```json围栏、
+    前后夹杂说明文字等格式，不再靠多次split产生中间字符串。
+    找不到时抛出ValueError。
+    """
+    start = content.find('{')
+    while start != -1:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(content, start)
+            return obj
+        except ValueError:
+            start = content.find('{', start + 1)
+    raise ValueError("回复中没有合法的JSON对象")
+
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 加载环境变量 - 明确指定项目根目录的.env文件。
+# 必须无条件加载：shell里可能只导出了OPENAI_API_KEY，
+# 而BASE_URL/MODEL按README的配置方式仍然放在.env里
 load_dotenv(os.path.join(BASE_DIR, '.env'))
 
 
+@dataclass(frozen=True)
+class _Config:
+    """模块导入时解析一次的环境配置，之后实例化不再反复读环境变量"""
+    api_key: str
+    base_url: str
+    model: str
+    judge_model: str
+    embedding_model: str
+
+
+_CFG = _Config(
+    api_key=os.getenv('OPENAI_API_KEY'),
+    base_url=os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1'),
+    model=os.getenv('OPENAI_MODEL', 'gpt-4'),
+    # 判题/解析只需要小模型，生成题目才用大模型
+    judge_model=os.getenv('OPENAI_JUDGE_MODEL', 'gpt-4o-mini'),
+    embedding_model=os.getenv('OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small'),
+)
+
+# 请求超时 - 连接要快失败(5s)，读取要容忍推理耗时(60s)
+REQUEST_TIMEOUT = Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0)
+
+# 连接池 - 保持长连接复用TLS会话，避免每次调用重新握手
+CONNECTION_LIMITS = Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60
+)
+
+# 并发判题的最大并行度 - 限制同时在途的请求数，避免触发限流
+GRADING_CONCURRENCY = 10
+
+# 异步客户端专用的常驻事件循环线程。
+# 连接池挂在loop上，每个请求都asyncio.run新建再关闭loop
+# 会杀掉池里的keep-alive连接，下一次批量判题全部报连接错误
+_async_loop = None
+_async_loop_lock = threading.Lock()
+
+
+def _get_async_loop():
+    """获取（或启动）运行异步客户端的常驻事件循环"""
+    global _async_loop
+    with _async_loop_lock:
+        if _async_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, daemon=True, name='ai-async-loop'
+            ).start()
+            _async_loop = loop
+    return _async_loop
+
+# 重试 - 只对瞬时错误(限流/超时/连接)做指数退避
+MAX_RETRIES = 5
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError)
+
+
+def _with_retry(func):
+    """对瞬时API错误做指数退避重试（1s、2s、4s...，最多5次）"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        wait = 1.0
+        for attempt in range(MAX_RETRIES):
+            try:
+                return func(*args, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_RETRIES - 1:
+                    raise
+                print(f"API请求失败（{e.__class__.__name__}），{wait:.0f}秒后重试...")
+                time.sleep(wait)
+                wait = min(wait * 2, 16.0)
+    return wrapper
+
+
+# 生成题目的静态部分（系统指令和工具schema）保持字节一致，
+# 这样服务端的自动前缀缓存才能跨调用复用，省输入token也降低首字延迟
+_QUESTION_SYSTEM_PROMPT = """你是一个专业的语言教学专家。请根据用户提供的文章内容为学生生成练习题。
+
+要求：
+1. 单选题和填空题混合
+2. 从文章中选择3-5个核心词汇出题
+3. 每道题要有详细解析
+4. 难度适合学生的词汇量等级
+
+请按schema以JSON格式返回题目。"""
+
+# 结构化输出schema - strict模式要求所有字段required，
+# 可选字段(hint/options)用null表达，解析后会把null剔除
+_QUESTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "type": {"type": "string", "enum": ["multiple_choice", "fill_blank"]},
+                    "question": {"type": "string"},
+                    "hint": {"type": ["string", "null"]},
+                    "options": {
+                        "type": ["array", "null"],
+                        "items": {"type": "string"}
+                    },
+                    "answer": {"type": "string"},
+                    "explanation": {"type": "string"},
+                    "word": {"type": "string"},
+                    "difficulty": {"type": "integer"}
+                },
+                "required": ["type", "question", "hint", "options", "answer",
+                             "explanation", "word", "difficulty"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["questions"],
+    "additionalProperties": False
+}
+
+_QUESTIONS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "questions",
+        "schema": _QUESTIONS_SCHEMA,
+        "strict": True
+    }
+}
+
+
+def _parse_questions_response(content):
+    """解析结构化输出的题目JSON，剔除值为null的可选字段"""
+    parsed = _json_loads(content)
+    return [
+        {k: v for k, v in q.items() if v is not None}
+        for q in parsed.get("questions", [])
+    ]
+
+# 判题与解析的提示词模板 - 模块级只构建一次，调用时仅做一次format
+_CHECK_ANSWER_PROMPT_TMPL = """请判断以下答案是否正确：
+
+题目：{question}
+正确答案：{answer}
+用户答案：{user_answer}
+
+要求：
+1. 判断用户答案是否正确（考虑拼写错误、同义词等情况）
+2. 如果错误，提供简短的解析
+
+请以JSON格式返回：
+{{
+    "is_correct": true/false,
+    "explanation": "解析内容",
+    "confidence": 0到1之间的小数，表示你对这次判断的把握
+}}
+"""
+
+_EXPLANATION_PROMPT_TMPL = """请为以下题目提供详细的解析：
+
+题目：{question}
+正确答案：{answer}
+用户答案：{user_answer}
+
+请解释：
+1. 为什么正确答案是正确的
+2. 用户答案可能存在的问题
+3. 相关的语法或词汇知识点
+
+解析应该简洁明了，适合学生理解。
+"""
+
+# 题目缓存 - 相同的文章+配置在有效期内直接复用上次生成的题目
+QUESTION_CACHE_FILE = os.path.join(BASE_DIR, 'data', 'question_cache.json')
+QUESTION_CACHE_TTL = 4 * 60 * 60  # 缓存有效期：4小时
+
+# 文章向量索引 - 轻微改动过的文章靠embedding相似度命中同一套题目
+ARTICLE_EMBEDDINGS_FILE = os.path.join(BASE_DIR, 'data', 'article_embeddings.json')
+SEMANTIC_HIT_THRESHOLD = 0.90  # 余弦相似度超过此值视为同一篇文章
+
+
+def _normalize_answer(text):
+    """归一化答案用于本地比较（NFKC统一全半角，去首尾空白，转小写）"""
+    return unicodedata.normalize('NFKC', str(text)).strip().lower()
+
+
+def _config_cache_key(user_config, count):
+    """计算用户配置+题目数量部分的缓存键"""
+    raw = json.dumps(user_config, sort_keys=True, ensure_ascii=False, default=str) + str(count)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _question_cache_key(article_content, user_config, count):
+    """计算题目缓存的键（文章内容+用户配置+题目数量的SHA256）"""
+    raw = article_content + _config_cache_key(user_config, count)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _load_question_cache():
+    """读取题目缓存文件，不存在或损坏时返回空缓存"""
+    if not os.path.exists(QUESTION_CACHE_FILE):
+        return {}
+    try:
+        with open(QUESTION_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"读取题目缓存失败: {e}")
+        return {}
+
+
+def _cosine_similarity(a, b):
+    """计算两个向量的余弦相似度"""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def _load_article_embeddings():
+    """读取文章向量索引，不存在或损坏时返回空列表"""
+    if not os.path.exists(ARTICLE_EMBEDDINGS_FILE):
+        return []
+    try:
+        with open(ARTICLE_EMBEDDINGS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"读取文章向量索引失败: {e}")
+        return []
+
+
+def _save_article_embeddings(entries):
+    """保存文章向量索引"""
+    try:
+        os.makedirs(os.path.dirname(ARTICLE_EMBEDDINGS_FILE), exist_ok=True)
+        with open(ARTICLE_EMBEDDINGS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+    except Exception as e:
+        print(f"保存文章向量索引失败: {e}")
+
+
+def _save_question_cache(cache):
+    """保存题目缓存，顺带清理过期条目"""
+    now = time.time()
+    cache = {k: v for k, v in cache.items() if now - v.get('ts', 0) < QUESTION_CACHE_TTL}
+    try:
+        os.makedirs(os.path.dirname(QUESTION_CACHE_FILE), exist_ok=True)
+        with open(QUESTION_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except Exception as e:
+        print(f"保存题目缓存失败: {e}")
+
+
 class AIService:
     """AI服务类"""
 
     def __init__(self):
         """初始化AI服务"""
-        self.api_key = os.getenv('OPENAI_API_KEY')
-        self.base_url = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
-        self.model = os.getenv('OPENAI_MODEL', 'gpt-4')
+        self.api_key = _CFG.api_key
+        self.base_url = _CFG.base_url
+        self.model = _CFG.model
+        self.judge_model = _CFG.judge_model
 
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY 环境变量未设置")
 
+        # max_retries=0: 重试策略由 _with_retry 统一控制，避免和SDK内置重试叠加
+        # 显式连接池让后续调用复用已握手的TLS连接
         self.client = OpenAI(
             api_key=self.api_key,
-            base_url=self.base_url
+            base_url=self.base_url,
+            timeout=REQUEST_TIMEOUT,
+            max_retries=0,
+            http_client=DefaultHttpxClient(
+                limits=CONNECTION_LIMITS,
+                timeout=REQUEST_TIMEOUT
+            )
+        )
+
+        # 异步客户端 - 用于并发发起多个独立请求
+        self.aclient = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            timeout=REQUEST_TIMEOUT,
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=CONNECTION_LIMITS,
+                timeout=REQUEST_TIMEOUT
+            )
         )
 
+    @_with_retry
+    def _chat_completion(self, **kwargs):
+        """带指数退避重试的 chat.completions.create"""
+        return self.client.chat.completions.create(**kwargs)
+
+    def _embed_article(self, article_content):
+        """计算文章embedding，失败时返回None（语义缓存退化为仅精确匹配）"""
+        try:
+            response = self.client.embeddings.create(
+                model=_CFG.embedding_model,
+                input=article_content
+            )
+            return response.data[0].embedding
+        except Exception as e:
+            print(f"计算文章embedding失败: {e}")
+            return None
+
+    def _question_prompt(self, article_content, vocab_level, language, learning_goal, count):
+        """构建题目生成的用户提示词（只包含每次调用会变化的内容）"""
+        return f"""学习语言：{language}
+词汇量等级：{vocab_level}/10
+学习目标：{learning_goal}
+题目数量：{count}道
+
+文章内容：
+{article_content}"""
+
     def generate_questions(self, article_content, user_config, count=15):
         """
-        使用 function calling 生成题目
+        调用AI生成题目（结构化输出）
 
         Args:
             article_content: 文章内容
@@ -41,116 +398,164 @@ class AIService:
         Returns:
             题目列表
         """
+        # 先查缓存：相同文章+配置在有效期内直接复用
+        cache_key = _question_cache_key(article_content, user_config, count)
+        cache = _load_question_cache()
+        entry = cache.get(cache_key)
+        if entry and time.time() - entry.get('ts', 0) < QUESTION_CACHE_TTL:
+            print(f"题目缓存命中，跳过AI调用")
+            return entry['questions']
+
+        # 精确未命中时做语义兜底：轻微改动过的文章靠embedding相似度命中
+        config_key = _config_cache_key(user_config, count)
+        embeddings = _load_article_embeddings()
+        embedding = self._embed_article(article_content)
+        if embedding is not None:
+            for emb_entry in embeddings:
+                if emb_entry.get('config_key') != config_key:
+                    continue
+                cached = cache.get(emb_entry.get('cache_key'))
+                if not cached or time.time() - cached.get('ts', 0) >= QUESTION_CACHE_TTL:
+                    continue
+                similarity = _cosine_similarity(embedding, emb_entry.get('vector', []))
+                if similarity > SEMANTIC_HIT_THRESHOLD:
+                    print(f"题目语义缓存命中（相似度{similarity:.3f}），跳过AI调用")
+                    return cached['questions']
+
         vocab_level = user_config.get('词汇量等级', '5')
         language = user_config.get('学习语言', '英语')
         learning_goal = user_config.get('学习目标', '日常交流')
 
-        # 定义 function schema
-        tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "create_questions",
-                    "description": f"根据文章内容创建{count}道{language}练习题",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "questions": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "type": {
-                                            "type": "string",
-                                            "enum": ["multiple_choice", "fill_blank"],
-                                            "description": "题目类型"
-                                        },
-                                        "question": {
-                                            "type": "string",
-                                            "description": "题目内容"
-                                        },
-                                        "hint": {
-                                            "type": "string",
-                                            "description": "提示信息（可选）"
-                                        },
-                                        "options": {
-                                            "type": "array",
-                                            "items": {"type": "string"},
-                                            "description": "选项（仅单选题需要，4个选项）",
-                                            "minItems": 4,
-                                            "maxItems": 4
-                                        },
-                                        "answer": {
-                                            "type": "string",
-                                            "description": "正确答案"
-                                        },
-                                        "explanation": {
-                                            "type": "string",
-                                            "description": "详细解析"
-                                        },
-                                        "word": {
-                                            "type": "string",
-                                            "description": "核心词汇"
-                                        },
-                                        "difficulty": {
-                                            "type": "integer",
-                                            "minimum": 1,
-                                            "maximum": 10,
-                                            "description": "难度等级（1-10）"
-                                        }
-                                    },
-                                    "required": ["type", "question", "answer", "explanation", "word", "difficulty"]
-                                }
-                            }
-                        },
-                        "required": ["questions"]
-                    }
-                }
-            }
-        ]
-
-        prompt = f"""请根据以下文章内容，为词汇量等级{vocab_level}/10的学生生成{count}道练习题。
-
-文章内容：
-{article_content}
-
-学习目标：{learning_goal}
-
-要求：
-1. 单选题和填空题混合
-2. 从文章中选择3-5个核心词汇出题
-3. 每道题要有详细解析
-4. 难度适合词汇量等级{vocab_level}的学生
-
-请调用 create_questions 函数来创建题目。"""
+        prompt = self._question_prompt(article_content, vocab_level, language, learning_goal, count)
 
         try:
             print(f"正在调用AI生成{count}道题目...")
-            response = self.client.chat.completions.create(
+            response = self._chat_completion(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": f"你是一个专业的{language}语言教学专家。"},
+                    {"role": "system", "content": _QUESTION_SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                tools=tools,
-                tool_choice={"type": "function", "function": {"name": "create_questions"}},
+                response_format=_QUESTIONS_RESPONSE_FORMAT,
                 temperature=0.7,
-                timeout=30.0  # 30秒超时
+                max_tokens=4000  # 限制输出长度，防止响应失控
             )
 
-            # 提取 function call 结果
-            tool_call = response.choices[0].message.tool_calls[0]
-            import json
-            function_args = json.loads(tool_call.function.arguments)
-            questions = function_args.get("questions", [])
+            # 结构化输出保证content是合法JSON
+            questions = _parse_questions_response(response.choices[0].message.content)
 
             print(f"AI成功生成{len(questions)}道题目")
+
+            # 写入缓存和向量索引
+            if questions:
+                cache[cache_key] = {'questions': questions, 'ts': time.time()}
+                _save_question_cache(cache)
+                if embedding is not None:
+                    # 顺带清掉缓存里已不存在（过期）条目的向量，索引不随时间膨胀
+                    embeddings = [e for e in embeddings if e.get('cache_key') in cache]
+                    embeddings.append({
+                        'cache_key': cache_key,
+                        'config_key': config_key,
+                        'vector': embedding
+                    })
+                    _save_article_embeddings(embeddings)
+
             return questions
 
         except Exception as e:
             print(f"AI生成题目失败: {e}")
             return None
 
+    def generate_questions_batch(self, articles, user_config, count=15):
+        """
+        使用 Batch API 批量生成题目（仅适合离线流程）
+
+        把所有文章写成一份JSONL提交到Batch接口，成本约为实时调用的一半，
+        吞吐量也更高，但完成窗口最长24小时，不要用在交互路径上。
+
+        Args:
+            articles: 文章内容列表
+            user_config: 用户配置字典
+            count: 每篇文章生成的题目数量
+
+        Returns:
+            题目列表的列表（与articles顺序一致，失败的条目为None），
+            批任务整体失败时返回None
+        """
+        import tempfile
+
+        vocab_level = user_config.get('词汇量等级', '5')
+        language = user_config.get('学习语言', '英语')
+        learning_goal = user_config.get('学习目标', '日常交流')
+
+        try:
+            # 1. 写入JSONL请求文件
+            with tempfile.NamedTemporaryFile(
+                mode='w', suffix='.jsonl', delete=False, encoding='utf-8'
+            ) as f:
+                jsonl_path = f.name
+                for i, article in enumerate(articles):
+                    request_line = {
+                        "custom_id": str(i),
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": self.model,
+                            "messages": [
+                                {"role": "system", "content": _QUESTION_SYSTEM_PROMPT},
+                                {"role": "user", "content": self._question_prompt(article, vocab_level, language, learning_goal, count)}
+                            ],
+                            "response_format": _QUESTIONS_RESPONSE_FORMAT,
+                            "temperature": 0.7
+                        }
+                    }
+                    f.write(json.dumps(request_line, ensure_ascii=False) + '\n')
+
+            # 2. 上传并提交批任务（无论成败都清掉临时文件）
+            try:
+                with open(jsonl_path, 'rb') as f:
+                    batch_file = self.client.files.create(file=f, purpose='batch')
+            finally:
+                os.unlink(jsonl_path)
+
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            print(f"批任务已提交: {batch.id}")
+
+            # 3. 指数退避轮询直到完成
+            wait = 5.0
+            while True:
+                batch = self.client.batches.retrieve(batch.id)
+                if batch.status == 'completed':
+                    break
+                if batch.status in ('failed', 'expired', 'cancelled'):
+                    print(f"批任务未完成: {batch.status}")
+                    return None
+                time.sleep(wait)
+                wait = min(wait * 2, 300.0)
+
+            # 4. 解析输出文件
+            output = self.client.files.content(batch.output_file_id)
+            results = {}
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    obj = _json_loads(line)
+                    message = obj['response']['body']['choices'][0]['message']
+                    results[obj['custom_id']] = _parse_questions_response(message['content'])
+                except Exception as e:
+                    print(f"解析批任务结果失败: {e}")
+
+            return [results.get(str(i)) for i in range(len(articles))]
+
+        except Exception as e:
+            print(f"批量生成题目失败: {e}")
+            return None
+
     def check_answer(self, question, user_answer):
         """
         使用AI判断答案是否正确
@@ -162,52 +567,262 @@ class AIService:
         Returns:
             (is_correct, explanation) 是否正确和解析
         """
-        prompt = f"""请判断以下答案是否正确：
+        user_answer_normalized = _normalize_answer(user_answer)
+        correct_normalized = _normalize_answer(question['answer'])
 
-题目：{question['question']}
-正确答案：{question['answer']}
-用户答案：{user_answer}
+        # 阶梯1：归一化后完全一致，本地直接判对
+        if user_answer_normalized == correct_normalized:
+            return True, question.get('explanation', '')
 
-要求：
-1. 判断用户答案是否正确（考虑拼写错误、同义词等情况）
-2. 如果错误，提供简短的解析
+        ratio = SequenceMatcher(None, user_answer_normalized, correct_normalized).ratio()
 
-请以JSON格式返回：
-{{
-    "is_correct": true/false,
-    "explanation": "解析内容"
-}}
-"""
+        # 阶梯2：高度相似视为笔误判对；相差悬殊直接判错，都不走API
+        if correct_normalized and ratio > 0.92:
+            return True, question.get('explanation', '')
+        if correct_normalized and ratio < 0.4:
+            return False, ''
 
+        # 阶梯3：模糊地带先用小模型判定，置信度足够就采纳。
+        # API失败会抛出异常而不会进缓存，恢复后同样的答案能重新判定
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            is_correct, explanation, confidence = self._check_answer_cached(
+                question['question'], question['answer'], user_answer_normalized,
+                self.judge_model
+            )
+        except Exception as e:
+            print(f"AI判题失败: {e}")
+            # 回退到简单的字符串匹配（走到这里两边必然不相等）
+            return user_answer_normalized == correct_normalized, ''
+
+        if confidence >= 0.8:
+            return is_correct, explanation
+
+        # 阶梯4：小模型没把握时才升级到大模型；升级失败就用小模型的结果
+        try:
+            is_correct, explanation, _ = self._check_answer_cached(
+                question['question'], question['answer'], user_answer_normalized,
+                self.model
+            )
+        except Exception as e:
+            print(f"AI判题失败: {e}")
+        return is_correct, explanation
+
+    @lru_cache(maxsize=10000)
+    def _check_answer_cached(self, question_text, correct_answer, user_answer, model):
+        """
+        check_answer 的缓存实现
+
+        参数拆成可哈希的字符串以便作为缓存键，
+        相同的(题目, 正确答案, 归一化用户答案, 模型)直接命中缓存。
+
+        Args:
+            question_text: 题目内容
+            correct_answer: 正确答案
+            user_answer: 归一化后的用户答案
+            model: 用于判定的模型
+
+        Returns:
+            (is_correct, explanation, confidence) 是否正确、解析和置信度
+
+        Raises:
+            Exception: API调用或解析失败时原样抛出——失败不能被lru_cache
+            记住，否则一次故障期间的判定会在进程存活期内一直生效
+        """
+        prompt = _CHECK_ANSWER_PROMPT_TMPL.format(
+            question=question_text, answer=correct_answer, user_answer=user_answer
+        )
+
+        response = self._chat_completion(
+            model=model,
+            messages=[
+                {"role": "system", "content": "你是一个专业的语言教师。"},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=150
+        )
+        content = response.choices[0].message.content.strip()
+
+        result = _extract_json_object(content)
+        try:
+            confidence = float(result.get('confidence', 1.0))
+        except (TypeError, ValueError):
+            confidence = 1.0
+        return result.get('is_correct', False), result.get('explanation', ''), confidence
+
+    def check_answer_stream(self, question, user_answer):
+        """
+        流式判断答案是否正确
+
+        以生成器方式逐块产出模型输出的文本片段，降低首字延迟。
+        流结束后会额外产出一个结果字典作为最后一项：
+        {'is_correct': true/false, 'explanation': '解析内容'}
+
+        Args:
+            question: 题目字典
+            user_answer: 用户答案
+
+        Yields:
+            模型输出的文本片段（str），最后一项为结果字典（dict）
+        """
+        prompt = _CHECK_ANSWER_PROMPT_TMPL.format(
+            question=question['question'], answer=question['answer'], user_answer=user_answer
+        )
+
+        response = self._chat_completion(
+            model=self.judge_model,
+            messages=[
+                {"role": "system", "content": "你是一个专业的语言教师。"},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.3,
+            max_tokens=150,
+            stream=True
+        )
+
+        buffer = []
+        for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                buffer.append(delta)
+                yield delta
+
+        # 流结束后解析完整内容
+        content = ''.join(buffer).strip()
+        try:
+            result = _extract_json_object(content)
+            yield {
+                'is_correct': result.get('is_correct', False),
+                'explanation': result.get('explanation', '')
+            }
+        except Exception as e:
+            print(f"AI流式判题解析失败: {e}")
+            is_correct = str(user_answer).strip().lower() == str(question['answer']).strip().lower()
+            yield {'is_correct': is_correct, 'explanation': ''}
+
+    async def _acheck_answer(self, question, user_answer):
+        """
+        check_answer 的异步版本
+
+        Args:
+            question: 题目字典
+            user_answer: 用户答案
+
+        Returns:
+            (is_correct, explanation) 是否正确和解析
+        """
+        prompt = _CHECK_ANSWER_PROMPT_TMPL.format(
+            question=question['question'], answer=question['answer'], user_answer=user_answer
+        )
+
+        try:
+            response = await self.aclient.chat.completions.create(
+                model=self.judge_model,
                 messages=[
                     {"role": "system", "content": "你是一个专业的语言教师。"},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.3,
-                max_tokens=500
+                max_tokens=150
             )
 
             content = response.choices[0].message.content.strip()
 
-            # 提取JSON
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-
-            import json
-            result = json.loads(content)
+            result = _extract_json_object(content)
             return result.get('is_correct', False), result.get('explanation', '')
 
         except Exception as e:
             print(f"AI判题失败: {e}")
-            # 如果AI判题失败，回退到简单的字符串匹配
             is_correct = str(user_answer).strip().lower() == str(question['answer']).strip().lower()
             return is_correct, ''
 
+    async def check_answers_batch(self, pairs):
+        """
+        并发判定一批答案
+
+        多个独立的判题请求通过 asyncio.gather 同时发出，
+        总耗时约等于最慢一次请求而不是所有请求之和。
+        信号量限制同时在途的请求数（GRADING_CONCURRENCY），
+        整份试卷一起判也不会超出速率限制。
+        同步调用方可以用 asyncio.run(ai_service.check_answers_batch(pairs)) 使用。
+
+        Args:
+            pairs: [(question, user_answer), ...] 列表
+
+        Returns:
+            [(is_correct, explanation), ...] 与输入顺序一致
+        """
+        sem = asyncio.Semaphore(GRADING_CONCURRENCY)
+
+        async def check_one(q, a):
+            async with sem:
+                return await self._acheck_answer(q, a)
+
+        return await asyncio.gather(
+            *[check_one(q, a) for q, a in pairs]
+        )
+
+    def check_answers_batch_sync(self, pairs):
+        """
+        check_answers_batch 的同步入口
+
+        协程提交到常驻事件循环执行，异步客户端的连接池
+        在多次调用之间保持存活。
+
+        Args:
+            pairs: [(question, user_answer), ...] 列表
+
+        Returns:
+            [(is_correct, explanation), ...] 与输入顺序一致
+        """
+        future = asyncio.run_coroutine_threadsafe(
+            self.check_answers_batch(pairs), _get_async_loop()
+        )
+        return future.result()
+
+    def get_explanation_stream(self, question, user_answer):
+        """
+        流式获取题目解析
+
+        以生成器方式逐块产出解析文本，前端可以边接收边渲染，
+        首字延迟从完整生成时间降低到首token时间。
+
+        Args:
+            question: 题目字典
+            user_answer: 用户答案
+
+        Yields:
+            解析文本片段
+        """
+        if user_answer == question['answer']:
+            yield question.get('explanation', '回答正确！')
+            return
+
+        prompt = _EXPLANATION_PROMPT_TMPL.format(
+            question=question['question'], answer=question['answer'], user_answer=user_answer
+        )
+
+        try:
+            response = self._chat_completion(
+                model=self.judge_model,
+                messages=[
+                    {"role": "system", "content": "你是一个耐心的语言教师。"},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.5,
+                max_tokens=500,
+                stream=True
+            )
+
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+
+        except Exception as e:
+            print(f"AI流式生成解析失败: {e}")
+            yield question.get('explanation', '')
+
     def get_explanation(self, question, user_answer):
         """
         获取题目解析
@@ -222,23 +837,13 @@ class AIService:
         if user_answer == question['answer']:
             return question.get('explanation', '回答正确！')
 
-        prompt = f"""请为以下题目提供详细的解析：
-
-题目：{question['question']}
-正确答案：{question['answer']}
-用户答案：{user_answer}
-
-请解释：
-1. 为什么正确答案是正确的
-2. 用户答案可能存在的问题
-3. 相关的语法或词汇知识点
-
-解析应该简洁明了，适合学生理解。
-"""
+        prompt = _EXPLANATION_PROMPT_TMPL.format(
+            question=question['question'], answer=question['answer'], user_answer=user_answer
+        )
 
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
+            response = self._chat_completion(
+                model=self.judge_model,
                 messages=[
                     {"role": "system", "content": "你是一个耐心的语言教师。"},
                     {"role": "user", "content": prompt}
@@ -1,25 +1,316 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, Response, g
+import atexit
+import copy
 import os
 import csv
 import json
+import logging
+import queue
+import re
+import threading
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import random
 from question_generator import get_question_generator
 from review_strategy import get_review_strategy
 
+# JSON编解码 - 优先orjson（C实现，比标准库快数倍），未安装时退回标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _json_dumps(obj):
+    """序列化为非ASCII不转义的JSON字符串"""
+    if _orjson is not None:
+        return _orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def _json_loads(s):
+    """热路径上的JSON解析，优先走orjson"""
+    if _orjson is not None:
+        return _orjson.loads(s)
+    return json.loads(s)
+
+
 # Flask应用 - 指定模板和静态文件目录
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 app = Flask(__name__, template_folder=os.path.join(BASE_DIR, 'templates'))
 
+
+def _json_response(obj, status=200):
+    """代替jsonify构造JSON响应，省掉Flask默认编码器的额外开销"""
+    return app.response_class(_json_dumps(obj), status=status, mimetype='application/json')
+
+log = logging.getLogger(__name__)
+
 # 配置
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 ARTICLES_DIR = os.path.join(BASE_DIR, 'articles')
 USER_CONFIG_FILE = os.path.join(BASE_DIR, 'user.md')
+# 按练习分文件的题目记录，结果页直接按practice_id取文件，不用扫整个历史CSV
+PRACTICES_DIR = os.path.join(DATA_DIR, 'practices')
+# 当前语言指针文件 - 切换语言只改这一个小文件，不重写整个user.md
+CURRENT_LANGUAGE_FILE = os.path.join(DATA_DIR, 'current_language.txt')
+
+# practice_id 只允许uuid字符集，防止把奇怪的值拼进sidecar文件名
+_PRACTICE_ID_RE = re.compile(r'^[0-9a-fA-F-]+$')
 
 # 确保必要的目录存在
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(ARTICLES_DIR, exist_ok=True)
+os.makedirs(PRACTICES_DIR, exist_ok=True)
+
+# 后台任务队列 - 单词进度更新（SM-2计算+三趟CSV读写）移出答题请求路径，
+# 接口立即返回，落盘藏在用户看下一题的时间里
+_TASK_QUEUE = queue.Queue()
+
+
+def _task_worker():
+    """后台循环执行耗时的落盘任务"""
+    while True:
+        func, args = _TASK_QUEUE.get()
+        try:
+            func(*args)
+        except Exception as e:
+            log.warning("后台任务失败: %s", e)
+        finally:
+            _TASK_QUEUE.task_done()
+
+
+threading.Thread(target=_task_worker, daemon=True, name='task-worker').start()
+# 进程退出前清空队列，避免丢进度
+atexit.register(_TASK_QUEUE.join)
+
+
+def _update_word_progress_task(word, language, is_correct):
+    """后台更新单词进度（SM-2算法）"""
+    review_strategy = get_review_strategy(DATA_DIR)
+    review_strategy.update_word_progress(
+        word=word,
+        language=language,
+        is_correct=is_correct
+    )
+    log.debug("已更新单词进度: %s, 正确: %s", word, is_correct)
+
+
+# 解析预生成 - 答错时立刻在后台生成AI解析，
+# 用户点"查看解析"时通常已经就绪，感知延迟接近0
+_EXPLANATION_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+_EXPLANATION_FUTURES = {}
+_EXPLANATION_FUTURES_MAX = 256  # 上限，用户一直不看解析时淘汰最旧条目
+_EXPLANATION_LOCK = threading.Lock()
+
+
+# AI解析的提示词模板 - 模块级只构建一次，调用时仅做一次format
+_AI_EXPLANATION_PROMPT_TMPL = """请为以下题目提供详细的AI解析：
+
+【题目】
+{question}
+
+【题目类型】
+{question_type}
+
+【核心词汇】
+{word}
+
+【正确答案】
+{correct_answer}
+
+【用户答案】
+{user_answer}
+
+【解析要求】
+请提供一份详细的、教学性的解析，包括：
+
+1. **正确答案解析**：
+   - 为什么这是正确答案
+   - 语法或词汇依据
+   - 语境分析
+
+2. **用户答案分析**：
+   - 如果用户答对了：肯定并强化理解
+   - 如果用户答错了：指出错误原因，常见陷阱
+
+3. **知识点讲解**：
+   - 核心词汇"{word}"的详细解释
+   - 相关的语法点（如果适用）
+   - 常见用法和搭配
+
+4. **记忆技巧**：
+   - 提供记忆该单词或语法点的方法
+   - 实际应用场景
+
+5. **拓展学习**：
+   - 同义词或反义词（如果适用）
+   - 相关表达或例句
+
+解析应该：
+- 用中文解释
+- 亲切鼓励的语气
+- 简洁但全面
+- 适合学生理解
+"""
+
+
+def _now_iso():
+    """当前时间的ISO字符串，同一请求内只构造一次并复用"""
+    try:
+        if not hasattr(g, '_now_iso'):
+            g._now_iso = datetime.now().isoformat()
+        return g._now_iso
+    except RuntimeError:
+        # 请求上下文之外（启动、后台线程）时现算
+        return datetime.now().isoformat()
+
+
+# 历史CSV的持久追加句柄 - 每行一次open/write/close的开销改为
+# 64KiB缓冲里的内存写，每FLUSH_EVERY行或进程退出时落盘
+_HISTORY_FIELDS = {
+    'practice_history.csv': ['practice_id', 'timestamp', 'source_article', 'words_learned', 'question_count', 'correct_count', 'accuracy', 'difficulty', 'time_spent', 'language'],
+    'question_history.csv': ['question_id', 'practice_id', 'timestamp', 'question_type', 'word', 'question_content', 'correct_answer', 'user_answer', 'is_correct', 'difficulty', 'language'],
+}
+_HISTORY_FLUSH_EVERY = 20
+_history_writers = {}
+_history_lock = threading.Lock()
+
+
+def _append_history_row(filename, row):
+    """通过持久句柄向历史CSV追加一行，Flask可能并发分发所以加锁"""
+    with _history_lock:
+        entry = _history_writers.get(filename)
+        if entry is None:
+            filepath = os.path.join(DATA_DIR, filename)
+            f = open(filepath, 'a', newline='', encoding='utf-8', buffering=65536)
+            writer = csv.DictWriter(f, fieldnames=_HISTORY_FIELDS[filename])
+            entry = {'file': f, 'writer': writer, 'pending': 0}
+            _history_writers[filename] = entry
+
+        entry['writer'].writerow(row)
+        entry['pending'] += 1
+        if entry['pending'] >= _HISTORY_FLUSH_EVERY:
+            entry['file'].flush()
+            entry['pending'] = 0
+
+
+def _flush_history(filename=None):
+    """冲刷缓冲中的历史记录（读取方在扫描文件前调用）"""
+    with _history_lock:
+        if filename is None:
+            entries = list(_history_writers.values())
+        elif filename in _history_writers:
+            entries = [_history_writers[filename]]
+        else:
+            entries = []
+        for entry in entries:
+            try:
+                entry['file'].flush()
+                entry['pending'] = 0
+            except Exception:
+                pass
+
+
+atexit.register(_flush_history)
+
+
+# user.md 的 "key：value" 行用一次预编译正则扫描整个文件，
+# 代替逐行split的Python级分支
+_CFG_LINE_RE = re.compile(r'^\s*-?\s*([^：:\n]+?)\s*[：:]\s*(.+?)\s*$', re.M)
+
+
+# word_progress.csv 的语言级聚合缓存 - 按文件mtime失效。
+# 数据层按项目约定保持纯CSV文件（不迁SQLite），
+# mtime不变时统计接口直接复用上次的单趟聚合结果，重复请求O(1)
+_word_stats_cache = {'mtime': None, 'stats': {}}
+_word_stats_lock = threading.Lock()
+
+
+def _word_progress_stats():
+    """
+    单趟扫描word_progress.csv，按语言聚合单词掌握统计
+
+    Returns:
+        {language: {'total': 总数, 'mastered': 已掌握数,
+                    'learning': 学习中数, 'mastery_sum': 掌握度之和}}
+    """
+    filepath = os.path.join(DATA_DIR, 'word_progress.csv')
+    if not os.path.exists(filepath):
+        return {}
+
+    mtime = os.stat(filepath).st_mtime_ns
+    with _word_stats_lock:
+        if _word_stats_cache['mtime'] == mtime:
+            return _word_stats_cache['stats']
+
+    stats = {}
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        # 位置索引代替DictReader，扫描路径上不再每行分配一个dict
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {}
+        lang_i = header.index('language')
+        mastery_i = header.index('mastery_level')
+        for row in reader:
+            if len(row) <= max(lang_i, mastery_i):
+                continue
+            lang = row[lang_i]
+            try:
+                mastery = float(row[mastery_i])
+            except (TypeError, ValueError):
+                mastery = 0.0
+
+            entry = stats.setdefault(lang, {'total': 0, 'mastered': 0, 'learning': 0, 'mastery_sum': 0.0})
+            entry['total'] += 1
+            entry['mastery_sum'] += mastery
+            # 与 ReviewStrategy 的掌握度口径一致：>= 0.8 视为已掌握
+            if mastery >= 0.8:
+                entry['mastered'] += 1
+            else:
+                entry['learning'] += 1
+
+    with _word_stats_lock:
+        _word_stats_cache['mtime'] = mtime
+        _word_stats_cache['stats'] = stats
+
+    return stats
+
+
+# 用户配置缓存 - 按user.md的mtime失效，
+# 几乎每个接口都要读配置，缓存后热路径不再重复读盘+解析JSON
+_profile_cache = None
+_profile_mtime = None
+_profile_lock = threading.Lock()
+
+
+def _current_language_override():
+    """读取当前语言指针文件，不存在或为空时返回None"""
+    if os.path.exists(CURRENT_LANGUAGE_FILE):
+        try:
+            with open(CURRENT_LANGUAGE_FILE, 'r', encoding='utf-8') as f:
+                lang = f.read().strip()
+            return lang or None
+        except OSError:
+            return None
+    return None
+
+
+def _save_current_language(language):
+    """写入当前语言指针文件"""
+    with open(CURRENT_LANGUAGE_FILE, 'w', encoding='utf-8') as f:
+        f.write(language)
+
+
+def _invalidate_profile_cache():
+    """写入配置文件后使缓存失效"""
+    global _profile_cache, _profile_mtime
+    with _profile_lock:
+        _profile_cache = None
+        _profile_mtime = None
 
 
 # ==================== 数据管理函数 ====================
@@ -47,20 +338,28 @@ def get_user_profile():
     Returns:
         dict: 包含用户配置的字典，包括 learning_languages (dict) 和 current_language (str)
     """
+    global _profile_cache, _profile_mtime
+
     if os.path.exists(USER_CONFIG_FILE):
+        # mtime没变时直接返回缓存副本，跳过读盘和解析
+        mtime = os.stat(USER_CONFIG_FILE).st_mtime_ns
+        with _profile_lock:
+            if _profile_cache is not None and mtime == _profile_mtime:
+                config = copy.deepcopy(_profile_cache)
+                override = _current_language_override()
+                if override and override in config.get('learning_languages', {}):
+                    config['current_language'] = override
+                return config
+
         with open(USER_CONFIG_FILE, 'r', encoding='utf-8') as f:
             content = f.read()
-            # 简单解析Markdown格式的配置
-            config = {}
-            for line in content.split('\n'):
-                if '：' in line or ': ' in line:
-                    key, value = line.split('：' if '：' in line else ': ', 1)
-                    config[key.strip().strip('-').strip()] = value.strip()
+            # 简单解析Markdown格式的配置（单趟正则扫描）
+            config = dict(_CFG_LINE_RE.findall(content))
 
             # 解析 learning_languages JSON
             if 'learning_languages' in config:
                 try:
-                    config['learning_languages'] = json.loads(config['learning_languages'])
+                    config['learning_languages'] = _json_loads(config['learning_languages'])
                 except:
                     config['learning_languages'] = {}
             else:
@@ -83,57 +382,98 @@ def get_user_profile():
                 else:
                     config['learning_languages'] = {}
 
+            with _profile_lock:
+                _profile_cache = copy.deepcopy(config)
+                _profile_mtime = mtime
+
+            # 指针文件优先于user.md里的current_language（切换语言只写指针）
+            override = _current_language_override()
+            if override and override in config.get('learning_languages', {}):
+                config['current_language'] = override
+
             return config
     return None
 
 
-def save_user_profile_to_csv(config):
-    """将用户配置保存到CSV文件"""
-    filepath = os.path.join(DATA_DIR, 'user_profile.csv')
+_USER_PROFILE_FIELDS = ['user_id', 'learning_languages', 'current_language', 'total_practice_count', 'total_words_learned', 'created_at', 'last_practice']
+
+# user_profile.csv 概念上只有一行，user_id/created_at缓存在进程内，
+# 保存时直接单行覆盖写，不再先整读再整写
+_user_identity = None
+
+
+def _get_user_identity(filepath):
+    """获取（或初始化）用户的user_id和created_at，只在进程内首次调用时读盘"""
+    global _user_identity
+    if _user_identity is not None:
+        return _user_identity
 
-    # 读取现有的用户记录（如果有）
-    existing_records = []
     if os.path.exists(filepath):
         with open(filepath, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
-            existing_records = list(reader)
+            for row in reader:
+                _user_identity = (row['user_id'], row['created_at'])
+                return _user_identity
+
+    _user_identity = (uuid.uuid4().hex, _now_iso())
+    return _user_identity
+
+
+def save_user_profile_to_csv(config, learning_languages_json=None):
+    """
+    将用户配置保存到CSV文件（单行覆盖写）
+
+    Args:
+        config: 用户配置字典
+        learning_languages_json: 已序列化的learning_languages（可选，
+            调用方刚好序列化过时传入，避免重复json.dumps）
+    """
+    filepath = os.path.join(DATA_DIR, 'user_profile.csv')
+    user_id, created_at = _get_user_identity(filepath)
 
     # 准备数据
-    learning_languages_json = json.dumps(config.get('learning_languages', {}), ensure_ascii=False)
+    if learning_languages_json is None:
+        learning_languages_json = _json_dumps(config.get('learning_languages', {}))
     current_language = config.get('current_language', list(config.get('learning_languages', {}).keys())[0] if config.get('learning_languages') else '英语')
 
     # 计算总统计
     total_practice = sum(lang_data.get('practice_count', 0) for lang_data in config.get('learning_languages', {}).values())
     total_words = sum(lang_data.get('words_learned', 0) for lang_data in config.get('learning_languages', {}).values())
 
-    if existing_records:
-        # 更新现有记录
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['user_id', 'learning_languages', 'current_language', 'total_practice_count', 'total_words_learned', 'created_at', 'last_practice'])
-            writer.writeheader()
-            for record in existing_records:
-                writer.writerow({
-                    'user_id': record['user_id'],
-                    'learning_languages': learning_languages_json,
-                    'current_language': current_language,
-                    'total_practice_count': total_practice,
-                    'total_words_learned': total_words,
-                    'created_at': record['created_at'],
-                    'last_practice': datetime.now().isoformat()
-                })
-    else:
-        # 创建新记录
-        with open(filepath, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=['user_id', 'learning_languages', 'current_language', 'total_practice_count', 'total_words_learned', 'created_at', 'last_practice'])
-            writer.writerow({
-                'user_id': str(uuid.uuid4()),
-                'learning_languages': learning_languages_json,
-                'current_language': current_language,
-                'total_practice_count': total_practice,
-                'total_words_learned': total_words,
-                'created_at': datetime.now().isoformat(),
-                'last_practice': datetime.now().isoformat()
-            })
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 16) as f:
+        writer = csv.DictWriter(f, fieldnames=_USER_PROFILE_FIELDS)
+        writer.writeheader()
+        writer.writerow({
+            'user_id': user_id,
+            'learning_languages': learning_languages_json,
+            'current_language': current_language,
+            'total_practice_count': total_practice,
+            'total_words_learned': total_words,
+            'created_at': created_at,
+            'last_practice': _now_iso()
+        })
+
+
+def _persist_profile(config, extra_lines=''):
+    """
+    持久化用户配置：learning_languages只序列化一次，
+    写入user.md后同步到CSV（三个语言管理接口共用）
+
+    Args:
+        config: 用户配置字典
+        extra_lines: 追加到user.md末尾的额外行（首次设置时的人类可读信息）
+    """
+    learning_languages_json = _json_dumps(config.get('learning_languages', {}))
+    content = f"""# 用户特征
+
+- learning_languages: {learning_languages_json}
+- current_language: {config.get('current_language', '')}
+{extra_lines}"""
+    with open(USER_CONFIG_FILE, 'w', encoding='utf-8') as f:
+        f.write(content)
+    _invalidate_profile_cache()
+
+    save_user_profile_to_csv(config, learning_languages_json)
 
 
 def save_user_profile(data):
@@ -163,20 +503,45 @@ def save_user_profile(data):
         'current_language': language
     }
 
-    # 保存到 Markdown 文件（用于人类阅读）
-    content = f"""# 用户特征
-
-- learning_languages: {json.dumps(learning_languages, ensure_ascii=False)}
-- current_language: {language}
-- 学习目标: {data.get('learning_goal', '日常交流')}
+    # 持久化（user.md里额外保留几行人类可读的偏好信息）
+    extra_lines = f"""- 学习目标: {data.get('learning_goal', '日常交流')}
 - 偏好题型: {data.get('question_type_preference', '单选为主')}
 - 每日学习时长: {daily_minutes}分钟
 """
-    with open(USER_CONFIG_FILE, 'w', encoding='utf-8') as f:
-        f.write(content)
+    _persist_profile(config, extra_lines)
+    _save_current_language(language)
+
 
-    # 保存到 CSV
-    save_user_profile_to_csv(config)
+# 难度调整结果缓存 - practice_history.csv的mtime和基础等级都没变时，
+# 同一语言直接复用上次的调整结果，不再重扫历史
+_difficulty_cache = {}
+_difficulty_lock = threading.Lock()
+
+
+def _adjusted_level(avg_accuracy, base_level):
+    """
+    根据平均准确率把基础等级调整到[1, 10]区间的纯数值函数
+
+    Args:
+        avg_accuracy: 平均准确率（0-100）
+        base_level: 基础词汇量等级
+
+    Returns:
+        调整后的等级
+    """
+    if avg_accuracy >= 90:
+        # 表现优秀，提升2级
+        return min(10, base_level + 2)
+    if avg_accuracy >= 80:
+        # 表现良好，提升1级
+        return min(10, base_level + 1)
+    if avg_accuracy <= 40:
+        # 表现较差，降低2级
+        return max(1, base_level - 2)
+    if avg_accuracy <= 50:
+        # 表现不太好，降低1级
+        return max(1, base_level - 1)
+    return base_level
 
 
 def adjust_difficulty_based_on_performance(user_config):
@@ -199,88 +564,89 @@ def adjust_difficulty_based_on_performance(user_config):
     base_level = learning_languages[current_language].get('level', 5)
 
     # 读取最近的练习记录（最近5次，针对当前语言）
+    _flush_history('practice_history.csv')  # 先把缓冲里的记录落盘
     filepath = os.path.join(DATA_DIR, 'practice_history.csv')
     if not os.path.exists(filepath):
         return base_level
 
-    recent_accuracies = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        # 获取最近5次练习的准确率（仅针对当前语言）
-        for row in rows[-5:]:
-            try:
-                # 检查语言是否匹配
-                if row.get('language', '') == current_language:
-                    acc = float(row['accuracy'])
-                    recent_accuracies.append(acc)
-            except (ValueError, KeyError):
-                continue
-
-    if not recent_accuracies:
-        return base_level
-
-    # 计算平均准确率
-    avg_accuracy = sum(recent_accuracies) / len(recent_accuracies)
-
-    # 动态调整难度
-    adjusted_level = base_level
-
-    if avg_accuracy >= 90:
-        # 表现优秀，提升2级
-        adjusted_level = min(10, base_level + 2)
-    elif avg_accuracy >= 80:
-        # 表现良好，提升1级
-        adjusted_level = min(10, base_level + 1)
-    elif avg_accuracy <= 40:
-        # 表现较差，降低2级
-        adjusted_level = max(1, base_level - 2)
-    elif avg_accuracy <= 50:
-        # 表现不太好，降低1级
-        adjusted_level = max(1, base_level - 1)
+    # 文件和基础等级都没变时直接用上次的结果
+    mtime = os.stat(filepath).st_mtime_ns
+    with _difficulty_lock:
+        cached = _difficulty_cache.get(current_language)
+        if cached is not None and cached[0] == mtime and cached[1] == base_level:
+            return cached[2]
+
+    # 流式扫描（位置索引），只保留当前语言最近5次的准确率
+    recent = deque(maxlen=5)
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is not None and 'language' in header and 'accuracy' in header:
+            lang_i = header.index('language')
+            acc_i = header.index('accuracy')
+            for row in reader:
+                if len(row) > max(lang_i, acc_i) and row[lang_i] == current_language:
+                    try:
+                        recent.append(float(row[acc_i]))
+                    except ValueError:
+                        continue
+    recent_accuracies = list(recent)
+
+    if recent_accuracies:
+        avg_accuracy = sum(recent_accuracies) / len(recent_accuracies)
+        adjusted_level = _adjusted_level(avg_accuracy, base_level)
+
+        # 如果调整了难度，打印日志
+        if adjusted_level != base_level:
+            log.info("动态难度调整[%s]：基础等级 %s → 调整后等级 %s（基于平均准确率 %.1f%%）", current_language, base_level, adjusted_level, avg_accuracy)
+    else:
+        adjusted_level = base_level
 
-    # 如果调整了难度，打印日志
-    if adjusted_level != base_level:
-        print(f"动态难度调整[{current_language}]：基础等级 {base_level} → 调整后等级 {adjusted_level}（基于平均准确率 {avg_accuracy:.1f}%）")
+    with _difficulty_lock:
+        _difficulty_cache[current_language] = (mtime, base_level, adjusted_level)
 
     return adjusted_level
 
 
 def save_practice_history(practice_id, data):
     """保存练习历史"""
-    filepath = os.path.join(DATA_DIR, 'practice_history.csv')
-    with open(filepath, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['practice_id', 'timestamp', 'source_article', 'words_learned', 'question_count', 'correct_count', 'accuracy', 'difficulty', 'time_spent'])
-        writer.writerow({
-            'practice_id': practice_id,
-            'timestamp': datetime.now().isoformat(),
-            'source_article': data.get('source_article', ''),
-            'words_learned': json.dumps(data.get('words_learned', [])),
-            'question_count': data.get('question_count', 0),
-            'correct_count': data.get('correct_count', 0),
-            'accuracy': data.get('accuracy', 0),
-            'difficulty': data.get('difficulty', 5),
-            'time_spent': data.get('time_spent', 0)
-        })
+    _append_history_row('practice_history.csv', {
+        'practice_id': practice_id,
+        'timestamp': _now_iso(),
+        'source_article': data.get('source_article', ''),
+        'words_learned': _json_dumps(data.get('words_learned', [])),
+        'question_count': data.get('question_count', 0),
+        'correct_count': data.get('correct_count', 0),
+        'accuracy': data.get('accuracy', 0),
+        'difficulty': data.get('difficulty', 5),
+        'time_spent': data.get('time_spent', 0),
+        'language': data.get('language', '')
+    })
 
 
 def save_question_history(practice_id, question_data):
-    """保存题目历史"""
-    filepath = os.path.join(DATA_DIR, 'question_history.csv')
-    with open(filepath, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['question_id', 'practice_id', 'timestamp', 'question_type', 'word', 'question_content', 'correct_answer', 'user_answer', 'is_correct', 'difficulty'])
-        writer.writerow({
-            'question_id': str(uuid.uuid4()),
-            'practice_id': practice_id,
-            'timestamp': datetime.now().isoformat(),
-            'question_type': question_data.get('type', ''),
-            'word': question_data.get('word', ''),
-            'question_content': question_data.get('question', ''),
-            'correct_answer': question_data.get('answer', ''),
-            'user_answer': question_data.get('user_answer', ''),
-            'is_correct': question_data.get('is_correct', False),
-            'difficulty': question_data.get('difficulty', 5)
-        })
+    """保存题目历史（CSV总表 + 按练习分文件的JSONL索引）"""
+    row = {
+        'question_id': uuid.uuid4().hex,
+        'practice_id': practice_id,
+        'timestamp': _now_iso(),
+        'question_type': question_data.get('type', ''),
+        'word': question_data.get('word', ''),
+        'question_content': question_data.get('question', ''),
+        'correct_answer': question_data.get('answer', ''),
+        'user_answer': question_data.get('user_answer', ''),
+        'is_correct': question_data.get('is_correct', False),
+        'difficulty': question_data.get('difficulty', 5),
+        'language': question_data.get('language', '')
+    }
+
+    _append_history_row('question_history.csv', row)
+
+    # 同步写入该练习自己的JSONL文件，结果页按practice_id直接读取
+    if practice_id and _PRACTICE_ID_RE.match(str(practice_id)):
+        sidecar = os.path.join(PRACTICES_DIR, f'{practice_id}.jsonl')
+        with open(sidecar, 'a', encoding='utf-8') as f:
+            f.write(_json_dumps(row) + '\n')
 
 
 # ==================== 路由 ====================
@@ -313,9 +679,9 @@ def setup():
     try:
         data = request.json
         save_user_profile(data)
-        return jsonify({'success': True})
+        return _json_response({'success': True})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/languages', methods=['GET'])
@@ -324,28 +690,18 @@ def get_languages():
     try:
         user_config = get_user_profile()
         if not user_config:
-            return jsonify({'success': False, 'error': '用户配置不存在'}), 400
+            return _json_response({'success': False, 'error': '用户配置不存在'}), 400
 
         learning_languages = user_config.get('learning_languages', {})
         current_language = user_config.get('current_language', '')
 
-        # 为每种语言添加统计信息
+        # 为每种语言添加统计信息（单趟聚合+缓存，不再按语言重复扫文件）
+        word_stats = _word_progress_stats()
         languages_with_stats = []
         for lang_name, lang_data in learning_languages.items():
-            # 从 word_progress.csv 获取该语言的单词掌握情况
-            mastered_words = 0
-            learning_words = 0
-            filepath = os.path.join(DATA_DIR, 'word_progress.csv')
-            if os.path.exists(filepath):
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        if row.get('language', '') == lang_name:
-                            mastery_level = int(row.get('mastery_level', 0))
-                            if mastery_level >= 4:
-                                mastered_words += 1
-                            else:
-                                learning_words += 1
+            lang_stats = word_stats.get(lang_name, {})
+            mastered_words = lang_stats.get('mastered', 0)
+            learning_words = lang_stats.get('learning', 0)
 
             languages_with_stats.append({
                 'name': lang_name,
@@ -358,13 +714,13 @@ def get_languages():
                 'is_current': lang_name == current_language
             })
 
-        return jsonify({
+        return _json_response({
             'success': True,
             'languages': languages_with_stats,
             'current_language': current_language
         })
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/languages/add', methods=['POST'])
@@ -377,17 +733,17 @@ def add_language():
         daily_minutes = int(data.get('daily_minutes', 15))
 
         if not language:
-            return jsonify({'success': False, 'error': '语言名称不能为空'}), 400
+            return _json_response({'success': False, 'error': '语言名称不能为空'}), 400
 
         user_config = get_user_profile()
         if not user_config:
-            return jsonify({'success': False, 'error': '用户配置不存在'}), 400
+            return _json_response({'success': False, 'error': '用户配置不存在'}), 400
 
         learning_languages = user_config.get('learning_languages', {})
 
         # 检查是否已经添加过该语言
         if language in learning_languages:
-            return jsonify({'success': False, 'error': '该语言已存在'}), 400
+            return _json_response({'success': False, 'error': '该语言已存在'}), 400
 
         # 添加新语言
         learning_languages[language] = {
@@ -402,20 +758,11 @@ def add_language():
         user_config['learning_languages'] = learning_languages
 
         # 保存到 CSV 和 Markdown 文件
-        save_user_profile_to_csv(user_config)
-
-        # 更新 Markdown 文件
-        content = f"""# 用户特征
+        _persist_profile(user_config)
 
-- learning_languages: {json.dumps(learning_languages, ensure_ascii=False)}
-- current_language: {user_config.get('current_language', language)}
-"""
-        with open(USER_CONFIG_FILE, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        return jsonify({'success': True})
+        return _json_response({'success': True})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/languages/remove', methods=['POST'])
@@ -426,17 +773,17 @@ def remove_language():
         language = data.get('language')
 
         if not language:
-            return jsonify({'success': False, 'error': '语言名称不能为空'}), 400
+            return _json_response({'success': False, 'error': '语言名称不能为空'}), 400
 
         user_config = get_user_profile()
         if not user_config:
-            return jsonify({'success': False, 'error': '用户配置不存在'}), 400
+            return _json_response({'success': False, 'error': '用户配置不存在'}), 400
 
         learning_languages = user_config.get('learning_languages', {})
 
         # 不能移除唯一语言
         if len(learning_languages) <= 1:
-            return jsonify({'success': False, 'error': '不能移除唯一的学习语言'}), 400
+            return _json_response({'success': False, 'error': '不能移除唯一的学习语言'}), 400
 
         # 移除语言
         if language in learning_languages:
@@ -445,26 +792,18 @@ def remove_language():
             # 如果移除的是当前语言，切换到第一个语言
             if user_config.get('current_language') == language:
                 user_config['current_language'] = list(learning_languages.keys())[0]
+                _save_current_language(user_config['current_language'])
 
             user_config['learning_languages'] = learning_languages
 
             # 保存到 CSV 和 Markdown 文件
-            save_user_profile_to_csv(user_config)
+            _persist_profile(user_config)
 
-            # 更新 Markdown 文件
-            content = f"""# 用户特征
+            return _json_response({'success': True, 'new_current': user_config.get('current_language')})
 
-- learning_languages: {json.dumps(learning_languages, ensure_ascii=False)}
-- current_language: {user_config.get('current_language')}
-"""
-            with open(USER_CONFIG_FILE, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-            return jsonify({'success': True, 'new_current': user_config.get('current_language')})
-
-        return jsonify({'success': False, 'error': '语言不存在'}), 400
+        return _json_response({'success': False, 'error': '语言不存在'}), 400
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/languages/switch', methods=['POST'])
@@ -475,77 +814,61 @@ def switch_language():
         language = data.get('language')
 
         if not language:
-            return jsonify({'success': False, 'error': '语言名称不能为空'}), 400
+            return _json_response({'success': False, 'error': '语言名称不能为空'}), 400
 
         user_config = get_user_profile()
         if not user_config:
-            return jsonify({'success': False, 'error': '用户配置不存在'}), 400
+            return _json_response({'success': False, 'error': '用户配置不存在'}), 400
 
         learning_languages = user_config.get('learning_languages', {})
 
         if language not in learning_languages:
-            return jsonify({'success': False, 'error': '该语言不存在'}), 400
+            return _json_response({'success': False, 'error': '该语言不存在'}), 400
 
-        # 切换语言
+        # 切换语言：只写当前语言指针和CSV，不再重写整个user.md
         user_config['current_language'] = language
-
-        # 保存到 CSV 和 Markdown 文件
+        _save_current_language(language)
         save_user_profile_to_csv(user_config)
 
-        # 更新 Markdown 文件
-        content = f"""# 用户特征
-
-- learning_languages: {json.dumps(learning_languages, ensure_ascii=False)}
-- current_language: {language}
-"""
-        with open(USER_CONFIG_FILE, 'w', encoding='utf-8') as f:
-            f.write(content)
-
-        return jsonify({'success': True, 'current_language': language})
+        return _json_response({'success': True, 'current_language': language})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/generate_questions', methods=['POST'])
 def generate_questions():
     """生成题目"""
-    print("=== 开始生成题目 ===")
     try:
         # 获取用户配置
-        print("1. 获取用户配置...")
         user_config = get_user_profile()
         if not user_config:
-            print("错误: 用户配置不存在")
-            return jsonify({'success': False, 'error': '用户配置不存在'}), 400
-        print(f"用户配置: {user_config}")
+            log.warning("生成题目失败: 用户配置不存在")
+            return _json_response({'success': False, 'error': '用户配置不存在'}), 400
 
-        # 动态调整难度
-        print("2. 调整难度...")
+        # 动态调整难度。词汇量等级键会被下游的提示词构建直接读取，
+        # 同时更新结构化配置里当前语言的等级，保持两处一致
         adjusted_level = adjust_difficulty_based_on_performance(user_config)
         user_config['词汇量等级'] = str(adjusted_level)
-        print(f"调整后的等级: {adjusted_level}")
+        current_language = user_config.get('current_language', '英语')
+        if current_language in user_config.get('learning_languages', {}):
+            user_config['learning_languages'][current_language]['level'] = adjusted_level
 
         # 使用题目生成器生成题目
-        print("3. 初始化题目生成器...")
         generator = get_question_generator(ARTICLES_DIR, DATA_DIR)
-        print("4. 开始生成题目...")
         questions = generator.generate(user_config, count=15)
-        print(f"5. 题目生成完成，共 {len(questions)} 道")
+        log.debug("题目生成完成，共 %d 道（等级 %s）", len(questions), adjusted_level)
 
-        practice_id = str(uuid.uuid4())
-        print("=== 题目生成成功 ===")
+        practice_id = uuid.uuid4().hex
 
-        return jsonify({
+        return _json_response({
             'success': True,
             'practice_id': practice_id,
             'questions': questions,
             'adjusted_level': adjusted_level  # 返回调整后的等级
         })
     except Exception as e:
-        print(f"=== 题目生成失败: {e} ===")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)}), 500
+        log.exception("题目生成失败")
+        return _json_response({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/submit_answer', methods=['POST'])
@@ -564,29 +887,45 @@ def submit_answer():
             'answer': data.get('correct_answer', ''),
             'user_answer': data.get('user_answer', ''),
             'is_correct': is_correct,
-            'difficulty': 5
+            'difficulty': 5,
+            'language': data.get('language', '')
         }
         save_question_history(data['practice_id'], question_data)
 
-        # 更新单词进度（使用SM-2算法）
+        # 答错时后台预生成解析，等用户请求解析时直接取结果
+        if not is_correct:
+            try:
+                from ai_service import ai_service
+                if ai_service is not None:
+                    question_dict = {
+                        'question': data.get('question', ''),
+                        'answer': data.get('correct_answer', '')
+                    }
+                    future = _EXPLANATION_EXECUTOR.submit(
+                        ai_service.get_explanation, question_dict, data.get('user_answer', '')
+                    )
+                    with _EXPLANATION_LOCK:
+                        while len(_EXPLANATION_FUTURES) >= _EXPLANATION_FUTURES_MAX:
+                            _EXPLANATION_FUTURES.pop(next(iter(_EXPLANATION_FUTURES)))
+                        _EXPLANATION_FUTURES[(data.get('question', ''), data.get('user_answer', ''))] = future
+            except Exception as e:
+                log.warning("提交解析预生成任务失败: %s", e)
+
+        # 更新单词进度（使用SM-2算法）- 排入后台队列，不阻塞答题请求。
+        # 语言由前端随答案带上（生成题目时它就知道），缺失时才回读用户配置
         if word:
             try:
-                user_config = get_user_profile()
-                language = user_config.get('学习语言', '英语') if user_config else '英语'
-
-                review_strategy = get_review_strategy(DATA_DIR)
-                review_strategy.update_word_progress(
-                    word=word,
-                    language=language,
-                    is_correct=is_correct
-                )
-                print(f"已更新单词进度: {word}, 正确: {is_correct}")
+                language = data.get('language')
+                if not language:
+                    user_config = get_user_profile()
+                    language = user_config.get('current_language', '英语') if user_config else '英语'
+                _TASK_QUEUE.put((_update_word_progress_task, (word, language, is_correct)))
             except Exception as e:
-                print(f"更新单词进度失败: {e}")
+                log.warning("更新单词进度失败: %s", e)
 
-        return jsonify({'success': True})
+        return _json_response({'success': True})
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/practice_result', methods=['GET'])
@@ -595,30 +934,45 @@ def practice_result():
     try:
         practice_id = request.args.get('practice_id')
 
-        # 从question_history.csv中读取该练习的所有题目
-        filepath = os.path.join(DATA_DIR, 'question_history.csv')
         questions = []
-
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row['practice_id'] == practice_id:
-                        questions.append(row)
-
-        # 计算统计数据
+        sidecar = None
+        if practice_id and _PRACTICE_ID_RE.match(practice_id):
+            sidecar = os.path.join(PRACTICES_DIR, f'{practice_id}.jsonl')
+
+        if sidecar and os.path.exists(sidecar):
+            # O(1)定位：直接读该练习自己的JSONL文件
+            with open(sidecar, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        questions.append(_json_loads(line))
+        else:
+            # 旧练习没有JSONL索引，退回扫描question_history.csv
+            _flush_history('question_history.csv')
+            filepath = os.path.join(DATA_DIR, 'question_history.csv')
+            if os.path.exists(filepath):
+                with open(filepath, 'r', encoding='utf-8', newline='') as f:
+                    # 只为命中的行构造dict，其余行停留在list阶段
+                    reader = csv.reader(f)
+                    header = next(reader, None)
+                    if header is not None:
+                        pid_i = header.index('practice_id')
+                        for row in reader:
+                            if len(row) > pid_i and row[pid_i] == practice_id:
+                                questions.append(dict(zip(header, row)))
+
+        # 单趟完成统计、错题提取和生词收集
+        # （JSONL里is_correct是bool，CSV里是'True'/'False'字符串）
         total_count = len(questions)
-        correct_count = sum(1 for q in questions if q['is_correct'] == 'True')
-        accuracy = int((correct_count / total_count * 100)) if total_count > 0 else 0
-
-        # 提取错题
+        correct_count = 0
         wrong_questions = []
         words_learned = set()
 
         for idx, q in enumerate(questions):
             if q['word']:
                 words_learned.add(q['word'])
-            if q['is_correct'] == 'False':
+            if q['is_correct'] in (True, 'True'):
+                correct_count += 1
+            else:
                 wrong_questions.append({
                     'question_index': idx,
                     'type': q['question_type'],
@@ -628,7 +982,9 @@ def practice_result():
                     'explanation': ''  # AI解析功能待实现
                 })
 
-        return jsonify({
+        accuracy = int((correct_count / total_count * 100)) if total_count > 0 else 0
+
+        return _json_response({
             'success': True,
             'total_count': total_count,
             'correct_count': correct_count,
@@ -638,7 +994,7 @@ def practice_result():
             'wrong_questions': wrong_questions
         })
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/mastery_stats', methods=['GET'])
@@ -646,17 +1002,32 @@ def mastery_stats():
     """获取单词掌握情况统计"""
     try:
         user_config = get_user_profile()
-        language = user_config.get('学习语言', '英语') if user_config else '英语'
-
-        review_strategy = get_review_strategy(DATA_DIR)
-        stats = review_strategy.get_mastery_stats(language)
-
-        return jsonify({
+        language = user_config.get('current_language', '英语') if user_config else '英语'
+
+        # 复用word_progress的单趟聚合缓存，不再单独扫一遍文件
+        lang_stats = _word_progress_stats().get(language)
+        if lang_stats is None:
+            stats = {
+                'total_words': 0,
+                'mastered_words': 0,
+                'learning_words': 0,
+                'average_mastery': 0.0
+            }
+        else:
+            total = lang_stats['total']
+            stats = {
+                'total_words': total,
+                'mastered_words': lang_stats['mastered'],
+                'learning_words': lang_stats['learning'],
+                'average_mastery': round(lang_stats['mastery_sum'] / total * 100, 1) if total else 0.0
+            }
+
+        return _json_response({
             'success': True,
             'stats': stats
         })
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return _json_response({'success': False, 'error': str(e)}), 500
 
 
 @app.route('/api/get_explanation', methods=['POST'])
@@ -666,7 +1037,7 @@ def get_explanation():
         from ai_service import ai_service
 
         if ai_service is None:
-            return jsonify({
+            return _json_response({
                 'success': False,
                 'error': 'AI服务不可用'
             }), 500
@@ -678,55 +1049,27 @@ def get_explanation():
         question_type = data.get('question_type', '')
         word = data.get('word', '')
 
-        # 构建prompt
-        prompt = f"""请为以下题目提供详细的AI解析：
-
-【题目】
-{question}
-
-【题目类型】
-{question_type}
-
-【核心词汇】
-{word}
-
-【正确答案】
-{correct_answer}
-
-【用户答案】
-{user_answer}
-
-【解析要求】
-请提供一份详细的、教学性的解析，包括：
-
-1. **正确答案解析**：
-   - 为什么这是正确答案
-   - 语法或词汇依据
-   - 语境分析
-
-2. **用户答案分析**：
-   - 如果用户答对了：肯定并强化理解
-   - 如果用户答错了：指出错误原因，常见陷阱
-
-3. **知识点讲解**：
-   - 核心词汇"{word}"的详细解释
-   - 相关的语法点（如果适用）
-   - 常见用法和搭配
-
-4. **记忆技巧**：
-   - 提供记忆该单词或语法点的方法
-   - 实际应用场景
-
-5. **拓展学习**：
-   - 同义词或反义词（如果适用）
-   - 相关表达或例句
-
-解析应该：
-- 用中文解释
-- 亲切鼓励的语气
-- 简洁但全面
-- 适合学生理解
-"""
+        # 先看后台有没有预生成好的解析
+        with _EXPLANATION_LOCK:
+            future = _EXPLANATION_FUTURES.pop((question, user_answer), None)
+        if future is not None:
+            try:
+                explanation = future.result(timeout=30)
+                if explanation:
+                    return _json_response({
+                        'success': True,
+                        'explanation': explanation
+                    })
+            except Exception as e:
+                log.warning("读取预生成解析失败: %s", e)
+
+        prompt = _AI_EXPLANATION_PROMPT_TMPL.format(
+            question=question,
+            question_type=question_type,
+            word=word,
+            correct_answer=correct_answer,
+            user_answer=user_answer
+        )
 
         response = ai_service.client.chat.completions.create(
             model=ai_service.model,
@@ -740,23 +1083,85 @@ def get_explanation():
 
         explanation = response.choices[0].message.content.strip()
 
-        return jsonify({
+        return _json_response({
             'success': True,
             'explanation': explanation
         })
 
     except Exception as e:
-        return jsonify({
+        return _json_response({
             'success': False,
             'error': str(e)
         }), 500
 
 
+@app.route('/api/check_answers', methods=['POST'])
+def check_answers():
+    """批量判题 - 并发发出判题请求，总耗时约等于最慢一次请求"""
+    try:
+        from ai_service import ai_service
+
+        if ai_service is None:
+            return _json_response({'success': False, 'error': 'AI服务不可用'}), 500
+
+        data = request.json
+        items = data.get('answers', [])
+        pairs = [
+            (
+                {'question': item.get('question', ''), 'answer': item.get('correct_answer', '')},
+                item.get('user_answer', '')
+            )
+            for item in items
+        ]
+
+        # 协程跑在ai_service的常驻事件循环上，连接池跨请求保持存活
+        results = ai_service.check_answers_batch_sync(pairs)
+
+        return _json_response({
+            'success': True,
+            'results': [
+                {'is_correct': is_correct, 'explanation': explanation}
+                for is_correct, explanation in results
+            ]
+        })
+    except Exception as e:
+        return _json_response({'success': False, 'error': str(e)}), 500
+
+
+@app.route('/api/get_explanation_stream', methods=['POST'])
+def get_explanation_stream():
+    """流式获取AI题目解析（SSE），浏览器可以边接收边渲染"""
+    from ai_service import ai_service
+
+    if ai_service is None:
+        return _json_response({
+            'success': False,
+            'error': 'AI服务不可用'
+        }), 500
+
+    data = request.json
+    question = {
+        'question': data.get('question', ''),
+        'answer': data.get('correct_answer', ''),
+        'explanation': data.get('explanation', '')
+    }
+    user_answer = data.get('user_answer', '')
+
+    def generate():
+        try:
+            for chunk in ai_service.get_explanation_stream(question, user_answer):
+                yield f"data: {_json_dumps({'delta': chunk})}\n\n"
+            yield "data: [DONE]\n\n"
+        except Exception as e:
+            yield f"data: {_json_dumps({'error': str(e)})}\n\n"
+
+    return Response(generate(), mimetype='text/event-stream')
+
+
 # ==================== 辅助函数 ====================
 
-def generate_default_questions():
-    """生成默认题目（演示用）"""
-    questions = [
+# 默认题目在模块导入时构建一次，调用方拿到的是浅拷贝
+_DEFAULT_QUESTIONS = (
         {
             'type': 'multiple_choice',
             'question': '请选择 "happy" 的中文释义',
@@ -900,12 +1305,17 @@ def generate_default_questions():
             'word': 'speak',
             'difficulty': 2
         }
-    ]
-    return questions
+)
+
+
+def generate_default_questions():
+    """生成默认题目（演示用）"""
+    return list(_DEFAULT_QUESTIONS)
 
 
 # ==================== 启动 ====================
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
     init_csv_files()
     app.run(debug=True)
@@ -3,11 +3,271 @@
 协调AI服务和复习策略，生成完整的题目集
 """
 
+import hashlib
+import json
 import os
 import random
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from pathlib import Path
+
 from ai_service import ai_service
 from review_strategy import get_review_strategy
 
+# JSON解析 - 优先使用orjson（原生实现，解析AI回复快数倍），未安装时退回标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+
+def _json_loads(s):
+    """AI回复的JSON解析，优先走orjson"""
+    if _orjson is not None:
+        return _orjson.loads(s)
+    return json.loads(s)
+
+
+class PromptCache:
+    """
+    提示词响应缓存（sqlite持久化）
+
+    相同的(模型, 系统提示, 用户提示, 温度)组合直接复用之前的回复，
+    热缓存时复习题生成从数秒的LLM调用变成本地毫秒级查询。
+    """
+
+    TTL = 30 * 24 * 3600  # 缓存有效期：30天
+
+    def __init__(self, data_dir):
+        """
+        初始化缓存
+
+        Args:
+            data_dir: 数据目录路径
+        """
+        self.db_path = os.path.join(data_dir, 'prompt_cache.sqlite')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS prompt_cache (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)'
+        )
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(model, system, user, temperature):
+        """计算缓存键"""
+        raw = f"{model}|{system}|{user}|{temperature}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """查询缓存，未命中或过期返回None"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            row = conn.execute(
+                'SELECT response, ts FROM prompt_cache WHERE key = ?', (key,)
+            ).fetchone()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"读取提示词缓存失败: {e}")
+            return None
+
+        if row is None or time.time() - row[1] >= self.TTL:
+            return None
+        return row[0]
+
+    def put(self, key, response):
+        """写入缓存"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute(
+                'INSERT OR REPLACE INTO prompt_cache (key, response, ts) VALUES (?, ?, ?)',
+                (key, response, int(time.time()))
+            )
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"写入提示词缓存失败: {e}")
+
+
+# 题目的必需字段
+_REQUIRED_FIELDS = frozenset(('type', 'question', 'answer', 'word'))
+
+
+# ```json围栏提取 - 正则只编译一次，单趟取出围栏内的内容
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def _extract_json(content):
+    """提取回复中的JSON文本（兼容```json围栏和裸JSON）"""
+    match = _JSON_FENCE_RE.search(content)
+    if match:
+        return match.group(1).strip()
+    return content.strip()
+
+
+# 每个数据目录一个缓存实例
+_prompt_caches = {}
+
+
+def _get_prompt_cache(data_dir):
+    """获取（或创建）数据目录对应的提示词缓存"""
+    cache = _prompt_caches.get(data_dir)
+    if cache is None:
+        cache = PromptCache(data_dir)
+        _prompt_caches[data_dir] = cache
+    return cache
+
+
+# 默认题目在模块导入时构建一次（AI不可用时的兜底），调用方拿到浅拷贝
+_DEFAULT_QUESTIONS = (
+    {
+        'type': 'multiple_choice',
+        'question': '请选择 "happy" 的中文释义',
+        'hint': '这是一个常用的形容词',
+        'options': ['悲伤的', '快乐的', '愤怒的', '疲惫的'],
+        'answer': '快乐的',
+        'explanation': 'Happy是一个常用的英语单词，意思是"快乐的、幸福的"。',
+        'word': 'happy',
+        'difficulty': 3
+    },
+    {
+        'type': 'multiple_choice',
+        'question': '请选择 "beautiful" 的中文释义',
+        'hint': '用来形容美好事物的形容词',
+        'options': ['丑陋的', '美丽的', '普通的', '奇怪的'],
+        'answer': '美丽的',
+        'explanation': 'Beautiful意为"美丽的、漂亮的"。',
+        'word': 'beautiful',
+        'difficulty': 4
+    },
+    {
+        'type': 'fill_blank',
+        'question': '完成句子：I am very _____ today.',
+        'hint': '填写一个表示"开心"的单词',
+        'answer': 'happy',
+        'explanation': '这句话的意思是"我今天很开心"。',
+        'word': 'happy',
+        'difficulty': 3
+    },
+    {
+        'type': 'multiple_choice',
+        'question': '请选择 "run" 的中文释义',
+        'hint': '这是一个动作动词',
+        'options': ['走', '跑', '跳', '飞'],
+        'answer': '跑',
+        'explanation': 'Run是一个常用的动词，意思是"跑、奔跑"。',
+        'word': 'run',
+        'difficulty': 2
+    },
+    {
+        'type': 'fill_blank',
+        'question': '完成句子：She likes to _____ in the park.',
+        'hint': '填写一个表示"跑步"的单词',
+        'answer': 'run',
+        'explanation': '这句话的意思是"她喜欢在公园里跑步"。',
+        'word': 'run',
+        'difficulty': 2
+    },
+    {
+        'type': 'multiple_choice',
+        'question': '请选择 "book" 的中文释义',
+        'hint': '这是一个常用的名词',
+        'options': ['书', '笔', '桌子', '椅子'],
+        'answer': '书',
+        'explanation': 'Book意为"书、书籍"。',
+        'word': 'book',
+        'difficulty': 1
+    },
+    {
+        'type': 'fill_blank',
+        'question': '完成句子：This is a good _____.',
+        'hint': '填写一个表示"书"的单词',
+        'answer': 'book',
+        'explanation': '这句话的意思是"这是一本好书"。',
+        'word': 'book',
+        'difficulty': 1
+    },
+    {
+        'type': 'multiple_choice',
+        'question': '请选择 "eat" 的中文释义',
+        'hint': '这是一个日常动作',
+        'options': ['喝', '吃', '睡', '玩'],
+        'answer': '吃',
+        'explanation': 'Eat是一个基本动词，意思是"吃"。',
+        'word': 'eat',
+        'difficulty': 1
+    },
+    {
+        'type': 'fill_blank',
+        'question': '完成句子：Let\'s _____ dinner together.',
+        'hint': '填写一个表示"吃"的单词',
+        'answer': 'eat',
+        'explanation': '这句话的意思是"让我们一起吃晚餐吧"。',
+        'word': 'eat',
+        'difficulty': 1
+    },
+    {
+        'type': 'multiple_choice',
+        'question': '请选择 "sleep" 的中文释义',
+        'hint': '每个人每天都要做的事情',
+        'options': ['工作', '睡觉', '运动', '学习'],
+        'answer': '睡觉',
+        'explanation': 'Sleep意为"睡觉"。',
+        'word': 'sleep',
+        'difficulty': 1
+    },
+    {
+        'type': 'fill_blank',
+        'question': '完成句子：I need to _____ now.',
+        'hint': '填写一个表示"睡觉"的单词',
+        'answer': 'sleep',
+        'explanation': '这句话的意思是"我现在需要睡觉"。',
+        'word': 'sleep',
+        'difficulty': 1
+    },
+    {
+        'type': 'multiple_choice',
+        'question': '请选择 "write" 的中文释义',
+        'hint': '与笔有关',
+        'options': ['读', '写', '看', '听'],
+        'answer': '写',
+        'explanation': 'Write意为"写、书写"。',
+        'word': 'write',
+        'difficulty': 2
+    },
+    {
+        'type': 'fill_blank',
+        'question': '完成句子：Please _____ your name here.',
+        'hint': '填写一个表示"写"的单词',
+        'answer': 'write',
+        'explanation': '这句话的意思是"请在这里写下你的名字"。',
+        'word': 'write',
+        'difficulty': 2
+    },
+    {
+        'type': 'multiple_choice',
+        'question': '请选择 "speak" 的中文释义',
+        'hint': '与嘴巴有关',
+        'options': ['听', '说', '读', '写'],
+        'answer': '说',
+        'explanation': 'Speak意为"说、说话"。',
+        'word': 'speak',
+        'difficulty': 2
+    },
+    {
+        'type': 'fill_blank',
+        'question': '完成句子：Can you _____ English?',
+        'hint': '填写一个表示"说"的单词',
+        'answer': 'speak',
+        'explanation': '这句话的意思是"你会说英语吗？"。',
+        'word': 'speak',
+        'difficulty': 2
+    }
+)
+
 
 class QuestionGenerator:
     """题目生成器"""
@@ -22,6 +282,77 @@ class QuestionGenerator:
         """
         self.articles_dir = articles_dir
         self.data_dir = data_dir
+        self.prompt_cache = _get_prompt_cache(data_dir)
+        # 文章列表缓存：(目录mtime_ns, 文件名列表)，目录没变时不再列目录
+        self._articles_cache = (None, [])
+        # 实例私有的随机数生成器，避开全局random的锁（并发生成时会争用）
+        self._rng = random.Random()
+
+    def _cached_chat(self, system, user, temperature=0.7, max_tokens=None):
+        """
+        带持久缓存的chat调用
+
+        相同提示词在缓存有效期内直接返回上次的回复内容，不触网。
+
+        Args:
+            system: 系统提示
+            user: 用户提示
+            temperature: 采样温度
+            max_tokens: 输出上限（可选）
+
+        Returns:
+            回复内容字符串
+        """
+        key = PromptCache.make_key(ai_service.model, system, user, temperature)
+        cached = self.prompt_cache.get(key)
+        if cached is not None:
+            return cached
+
+        kwargs = {}
+        if max_tokens is not None:
+            kwargs['max_tokens'] = max_tokens
+        response = ai_service.client.chat.completions.create(
+            model=ai_service.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            temperature=temperature,
+            **kwargs
+        )
+        content = response.choices[0].message.content.strip()
+
+        # 解析不出JSON的回复不入缓存，避免一次坏响应被固化整个TTL
+        try:
+            _json_loads(_extract_json(content))
+        except Exception:
+            return content
+
+        self.prompt_cache.put(key, content)
+        return content
+
+    def _article_names(self):
+        """
+        列出文章目录下的.txt文件名（带目录mtime缓存）
+
+        Returns:
+            文件名列表，目录不存在时为空列表
+        """
+        try:
+            mtime = os.stat(self.articles_dir).st_mtime_ns
+        except OSError:
+            return []
+
+        cached_mtime, articles = self._articles_cache
+        if mtime != cached_mtime:
+            # 目录有变化才重扫；scandir省掉listdir之后的逐文件stat
+            articles = [
+                entry.name for entry in os.scandir(self.articles_dir)
+                if entry.name.endswith('.txt') and entry.is_file()
+            ]
+            self._articles_cache = (mtime, articles)
+
+        return articles
 
     def get_random_article(self):
         """
@@ -30,19 +361,18 @@ class QuestionGenerator:
         Returns:
             文章内容字符串，如果没有文章则返回None
         """
-        articles = [f for f in os.listdir(self.articles_dir) if f.endswith('.txt')]
+        articles = self._article_names()
 
         if not articles:
             return None
 
-        random_article = random.choice(articles)
+        random_article = self._rng.choice(articles)
         article_path = os.path.join(self.articles_dir, random_article)
 
         try:
-            with open(article_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            return content
-        except Exception as e:
+            # read_text走CPython的快路径，比with+open+read少一层Python开销
+            return Path(article_path).read_text(encoding='utf-8', errors='replace')
+        except OSError as e:
             print(f"读取文章失败: {e}")
             return None
 
@@ -58,7 +388,7 @@ class QuestionGenerator:
             题目列表
         """
         all_questions = []
-        language = user_config.get('学习语言', '英语')
+        language = user_config.get('current_language', '英语')
 
         # 1. 获取需要复习的单词（最多5个）
         try:
@@ -71,26 +401,32 @@ class QuestionGenerator:
             words_due = []
             review_count = 0
 
-        # 2. 为复习单词生成题目
+        # 2. 冷启动快路径：没有到期复习词，又没有文章或AI可出新题时，
+        # 跳过后面的文章选择和AI分支，直接返回默认题目
+        if review_count == 0 and (ai_service is None or not self._article_names()):
+            print("没有复习词且无法生成新题，使用默认题目")
+            return list(_DEFAULT_QUESTIONS[:count])
+
+        # 3. 为复习单词生成题目
         if review_count > 0 and ai_service is not None:
             review_questions = self._generate_review_questions(words_due, user_config)
             all_questions.extend(review_questions)
 
-        # 3. 生成新题
+        # 4. 生成新题
         new_count = count - len(all_questions)
         if new_count > 0:
             new_questions = self._generate_new_questions(user_config, new_count)
             all_questions.extend(new_questions)
 
-        # 4. 混合题目
-        random.shuffle(all_questions)
+        # 5. 混合并截取：数量足够时random.sample一步完成（部分Fisher-Yates，
+        # O(count)且不原地打乱）；不足时补默认题后再整体打乱
+        if len(all_questions) >= count:
+            return self._rng.sample(all_questions, count)
 
-        # 5. 确保题目数量
-        if len(all_questions) < count:
-            print(f"题目数量不足，补充默认题目")
-            default_questions = self._get_default_questions()
-            needed = count - len(all_questions)
-            all_questions.extend(default_questions[:needed])
+        print(f"题目数量不足，补充默认题目")
+        needed = count - len(all_questions)
+        all_questions.extend(_DEFAULT_QUESTIONS[:needed])
+        self._rng.shuffle(all_questions)
 
         return all_questions[:count]
 
@@ -98,6 +434,9 @@ class QuestionGenerator:
         """
         为复习单词生成题目
 
+        优先把所有单词合并成一次AI调用（N次网络往返变1次），
+        批量调用失败或没有产出时退回逐词生成。
+
         Args:
             words_due: 需要复习的单词列表
             user_config: 用户配置
@@ -105,19 +444,120 @@ class QuestionGenerator:
         Returns:
             复习题列表
         """
-        review_questions = []
+        if not words_due:
+            return []
 
-        for word_data in words_due:
-            word = word_data['word']
+        try:
+            questions = self._generate_review_questions_batch(words_due, user_config)
+            if questions:
+                return questions
+        except Exception as e:
+            print(f"批量生成复习题失败，退回逐词生成: {e}")
 
-            # 为每个复习单词生成1-2道题
-            try:
-                prompt = f"""请为单词 "{word}" 生成1-2道复习题。
+        return self._generate_review_questions_per_word(words_due, user_config)
 
-学生信息：
-- 词汇量等级：{user_config.get('词汇量等级', '5')}/10
-- 该单词的掌握程度：{float(word_data['mastery_level']) * 100:.0f}%
-- 该单词已练习{word_data['total_attempts']}次，正确{word_data['correct_attempts']}次
+    def _generate_review_questions_batch(self, words_due, user_config):
+        """
+        用单次AI调用为所有复习单词生成题目
+
+        Args:
+            words_due: 需要复习的单词列表
+            user_config: 用户配置
+
+        Returns:
+            复习题列表（解析失败时抛出异常，由调用方决定回退）
+        """
+        words_info = [
+            {
+                'word': w['word'],
+                'mastery': round(float(w['mastery_level']), 2),
+                'total_attempts': int(w['total_attempts']),
+                'correct_attempts': int(w['correct_attempts'])
+            }
+            for w in words_due
+        ]
+
+        # 静态指令在前、每次变化的单词数据在后，
+        # 服务端的提示词前缀缓存才能跨调用命中
+        prompt = f"""请为下列每个复习单词各生成2道复习题。
+
+要求：
+1. 题目要帮助学生回忆和巩固对应的单词
+2. 可以是选择题或填空题，掌握程度低的单词题目更简单
+3. 每道题提供简短的解析
+4. 每道题的"word"字段必须是单词列表中的单词
+
+请以JSON数组格式返回：
+[
+  {{
+    "type": "multiple_choice" 或 "fill_blank",
+    "question": "题目内容",
+    "hint": "提示（可选）",
+    "options": ["选项A", "选项B", "选项C", "选项D"],  // 仅单选题需要
+    "answer": "正确答案",
+    "explanation": "解析",
+    "word": "对应的单词",
+    "difficulty": 3
+  }}
+]
+
+学生词汇量等级：{user_config.get('词汇量等级', '5')}/10
+
+需要复习的单词（mastery是掌握程度0-1，共需{2 * len(words_due)}道题）：
+{json.dumps(words_info, ensure_ascii=False)}
+"""
+
+        content = self._cached_chat(
+            "你是一个专业的语言教师，擅长设计复习题。",
+            prompt,
+            max_tokens=400 * len(words_due)
+        )
+
+        questions = _json_loads(_extract_json(content))
+
+        valid_words = {w['word'] for w in words_due}
+        return [
+            q for q in questions
+            if self._validate_question(q) and q.get('word') in valid_words
+        ]
+
+    def _generate_review_questions_per_word(self, words_due, user_config):
+        """
+        逐词生成复习题（批量调用的回退路径）
+
+        各单词的请求互相独立，用线程池并发发出，
+        总耗时约等于最慢一次调用而不是所有调用之和。
+
+        Args:
+            words_due: 需要复习的单词列表
+            user_config: 用户配置
+
+        Returns:
+            复习题列表
+        """
+        with ThreadPoolExecutor(max_workers=len(words_due)) as executor:
+            results = executor.map(
+                lambda word_data: self._generate_one_review(word_data, user_config),
+                words_due
+            )
+            return list(chain.from_iterable(results))
+
+    def _generate_one_review(self, word_data, user_config):
+        """
+        为单个复习单词生成1-2道题
+
+        Args:
+            word_data: 单词进度记录
+            user_config: 用户配置
+
+        Returns:
+            复习题列表，失败时返回默认复习题
+        """
+        word = word_data['word']
+
+        try:
+            # 静态指令在前、单词信息在后，提示词前缀可被服务端缓存复用
+            prompt = f"""请为指定的复习单词生成1-2道复习题。
 
 要求：
 1. 题目要帮助学生回忆和巩固该单词
@@ -134,43 +574,33 @@ class QuestionGenerator:
     "options": ["选项A", "选项B", "选项C", "选项D"],  // 仅单选题需要
     "answer": "正确答案",
     "explanation": "解析",
-    "word": "{word}",
+    "word": "对应的单词",
     "difficulty": 3
   }}
 ]
-"""
 
-                response = ai_service.client.chat.completions.create(
-                    model=ai_service.model,
-                    messages=[
-                        {"role": "system", "content": "你是一个专业的语言教师，擅长设计复习题。"},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=800
-                )
-
-                content = response.choices[0].message.content.strip()
+学生信息：
+- 词汇量等级：{user_config.get('词汇量等级', '5')}/10
+- 该单词的掌握程度：{float(word_data['mastery_level']) * 100:.0f}%
+- 该单词已练习{word_data['total_attempts']}次，正确{word_data['correct_attempts']}次
 
-                # 提取JSON
-                if "```json" in content:
-                    content = content.split("```json")[1].split("```")[0].strip()
-                elif "```" in content:
-                    content = content.split("```")[1].split("```")[0].strip()
+请复习单词："{word}"
+"""
 
-                import json
-                questions = json.loads(content)
+            content = self._cached_chat(
+                "你是一个专业的语言教师，擅长设计复习题。",
+                prompt,
+                max_tokens=800
+            )
 
-                for q in questions:
-                    if self._validate_question(q):
-                        review_questions.append(q)
+            questions = _json_loads(_extract_json(content))
 
-            except Exception as e:
-                print(f"生成复习题失败 ({word}): {e}")
-                # 使用默认复习题
-                review_questions.append(self._get_default_review_question(word))
+            return [q for q in questions if self._validate_question(q)]
 
-        return review_questions
+        except Exception as e:
+            print(f"生成复习题失败 ({word}): {e}")
+            # 使用默认复习题
+            return [self._get_default_review_question(word)]
 
     def _generate_new_questions(self, user_config, count):
         """
@@ -188,12 +618,12 @@ class QuestionGenerator:
 
         if not article_content:
             print("没有找到文章，使用默认题目")
-            return self._get_default_questions()[:count]
+            return list(_DEFAULT_QUESTIONS[:count])
 
         # 如果AI服务不可用，使用默认题目
         if ai_service is None:
             print("AI服务不可用，使用默认题目")
-            return self._get_default_questions()[:count]
+            return list(_DEFAULT_QUESTIONS[:count])
 
         # 使用AI生成题目
         try:
@@ -209,18 +639,17 @@ class QuestionGenerator:
                 # 如果生成的题目不够，补充默认题目
                 if len(validated_questions) < count:
                     print(f"AI生成的题目数量不足，已生成{len(validated_questions)}题")
-                    default_questions = self._get_default_questions()
                     needed = count - len(validated_questions)
-                    validated_questions.extend(default_questions[:needed])
+                    validated_questions.extend(_DEFAULT_QUESTIONS[:needed])
 
                 return validated_questions[:count]
             else:
                 print("AI未生成有效题目，使用默认题目")
-                return self._get_default_questions()[:count]
+                return list(_DEFAULT_QUESTIONS[:count])
 
         except Exception as e:
             print(f"生成题目失败: {e}")
-            return self._get_default_questions()[:count]
+            return list(_DEFAULT_QUESTIONS[:count])
 
     def _get_default_review_question(self, word):
         """
@@ -243,7 +672,8 @@ class QuestionGenerator:
             'difficulty': 3
         }
 
-    def _validate_question(self, question):
+    @staticmethod
+    def _validate_question(question):
         """
         验证题目格式是否正确
 
@@ -253,21 +683,18 @@ class QuestionGenerator:
         Returns:
             是否有效
         """
-        required_fields = ['type', 'question', 'answer', 'word']
-
-        # 检查必需字段
-        for field in required_fields:
-            if field not in question:
-                return False
+        # 必需字段一次C层面的子集判断
+        if not _REQUIRED_FIELDS.issubset(question):
+            return False
 
         # 检查题型
         if question['type'] == 'multiple_choice':
-            if 'options' not in question or not isinstance(question['options'], list):
-                return False
-            if len(question['options']) != 4:
-                return False
-            if question['answer'] not in question['options']:
-                return False
+            options = question.get('options')
+            return (
+                isinstance(options, list)
+                and len(options) == 4
+                and question['answer'] in options
+            )
 
         return True
 
@@ -276,153 +703,9 @@ class QuestionGenerator:
         获取默认题目（当AI不可用时使用）
 
         Returns:
-            默认题目列表
+            默认题目列表（浅拷贝，条目本身是共享的）
         """
-        return [
-            {
-                'type': 'multiple_choice',
-                'question': '请选择 "happy" 的中文释义',
-                'hint': '这是一个常用的形容词',
-                'options': ['悲伤的', '快乐的', '愤怒的', '疲惫的'],
-                'answer': '快乐的',
-                'explanation': 'Happy是一个常用的英语单词，意思是"快乐的、幸福的"。',
-                'word': 'happy',
-                'difficulty': 3
-            },
-            {
-                'type': 'multiple_choice',
-                'question': '请选择 "beautiful" 的中文释义',
-                'hint': '用来形容美好事物的形容词',
-                'options': ['丑陋的', '美丽的', '普通的', '奇怪的'],
-                'answer': '美丽的',
-                'explanation': 'Beautiful意为"美丽的、漂亮的"。',
-                'word': 'beautiful',
-                'difficulty': 4
-            },
-            {
-                'type': 'fill_blank',
-                'question': '完成句子：I am very _____ today.',
-                'hint': '填写一个表示"开心"的单词',
-                'answer': 'happy',
-                'explanation': '这句话的意思是"我今天很开心"。',
-                'word': 'happy',
-                'difficulty': 3
-            },
-            {
-                'type': 'multiple_choice',
-                'question': '请选择 "run" 的中文释义',
-                'hint': '这是一个动作动词',
-                'options': ['走', '跑', '跳', '飞'],
-                'answer': '跑',
-                'explanation': 'Run是一个常用的动词，意思是"跑、奔跑"。',
-                'word': 'run',
-                'difficulty': 2
-            },
-            {
-                'type': 'fill_blank',
-                'question': '完成句子：She likes to _____ in the park.',
-                'hint': '填写一个表示"跑步"的单词',
-                'answer': 'run',
-                'explanation': '这句话的意思是"她喜欢在公园里跑步"。',
-                'word': 'run',
-                'difficulty': 2
-            },
-            {
-                'type': 'multiple_choice',
-                'question': '请选择 "book" 的中文释义',
-                'hint': '这是一个常用的名词',
-                'options': ['书', '笔', '桌子', '椅子'],
-                'answer': '书',
-                'explanation': 'Book意为"书、书籍"。',
-                'word': 'book',
-                'difficulty': 1
-            },
-            {
-                'type': 'fill_blank',
-                'question': '完成句子：This is a good _____.',
-                'hint': '填写一个表示"书"的单词',
-                'answer': 'book',
-                'explanation': '这句话的意思是"这是一本好书"。',
-                'word': 'book',
-                'difficulty': 1
-            },
-            {
-                'type': 'multiple_choice',
-                'question': '请选择 "eat" 的中文释义',
-                'hint': '这是一个日常动作',
-                'options': ['喝', '吃', '睡', '玩'],
-                'answer': '吃',
-                'explanation': 'Eat是一个基本动词，意思是"吃"。',
-                'word': 'eat',
-                'difficulty': 1
-            },
-            {
-                'type': 'fill_blank',
-                'question': '完成句子：Let\'s _____ dinner together.',
-                'hint': '填写一个表示"吃"的单词',
-                'answer': 'eat',
-                'explanation': '这句话的意思是"让我们一起吃晚餐吧"。',
-                'word': 'eat',
-                'difficulty': 1
-            },
-            {
-                'type': 'multiple_choice',
-                'question': '请选择 "sleep" 的中文释义',
-                'hint': '每个人每天都要做的事情',
-                'options': ['工作', '睡觉', '运动', '学习'],
-                'answer': '睡觉',
-                'explanation': 'Sleep意为"睡觉"。',
-                'word': 'sleep',
-                'difficulty': 1
-            },
-            {
-                'type': 'fill_blank',
-                'question': '完成句子：I need to _____ now.',
-                'hint': '填写一个表示"睡觉"的单词',
-                'answer': 'sleep',
-                'explanation': '这句话的意思是"我现在需要睡觉"。',
-                'word': 'sleep',
-                'difficulty': 1
-            },
-            {
-                'type': 'multiple_choice',
-                'question': '请选择 "write" 的中文释义',
-                'hint': '与笔有关',
-                'options': ['读', '写', '看', '听'],
-                'answer': '写',
-                'explanation': 'Write意为"写、书写"。',
-                'word': 'write',
-                'difficulty': 2
-            },
-            {
-                'type': 'fill_blank',
-                'question': '完成句子：Please _____ your name here.',
-                'hint': '填写一个表示"写"的单词',
-                'answer': 'write',
-                'explanation': '这句话的意思是"请在这里写下你的名字"。',
-                'word': 'write',
-                'difficulty': 2
-            },
-            {
-                'type': 'multiple_choice',
-                'question': '请选择 "speak" 的中文释义',
-                'hint': '与嘴巴有关',
-                'options': ['听', '说', '读', '写'],
-                'answer': '说',
-                'explanation': 'Speak意为"说、说话"。',
-                'word': 'speak',
-                'difficulty': 2
-            },
-            {
-                'type': 'fill_blank',
-                'question': '完成句子：Can you _____ English?',
-                'hint': '填写一个表示"说"的单词',
-                'answer': 'speak',
-                'explanation': '这句话的意思是"你会说英语吗？"。',
-                'word': 'speak',
-                'difficulty': 2
-            }
-        ]
+        return list(_DEFAULT_QUESTIONS)
 
 
 # 创建全局实例
@@ -3,10 +3,15 @@
 实现SM-2间隔重复算法
 """
 
+import bisect
+import itertools
 import os
 import csv
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 
 class SM2Algorithm:
@@ -23,7 +28,7 @@ class SM2Algorithm:
     MIN_EF = 1.3
 
     @staticmethod
-    def calculate_next_review(quality, easiness_factor, interval, repetitions):
+    def calculate_next_review(quality, easiness_factor, interval, repetitions, now=None):
         """
         计算下次复习时间
 
@@ -38,10 +43,35 @@ class SM2Algorithm:
             easiness_factor: 当前轻松度因子
             interval: 当前间隔（天数）
             repetitions: 当前重复次数
+            now: 当前时间（可选，调用方传入以避免重复取墙钟）
 
         Returns:
             (new_easiness_factor, new_interval, new_repetitions, next_review_date)
         """
+        # 纯数值部分走LRU缓存（EF取3位小数限定键空间），日期在缓存外计算
+        new_easiness_factor, new_interval, new_repetitions = SM2Algorithm._sm2_core(
+            quality, round(easiness_factor, 3), interval, repetitions
+        )
+
+        # 计算下次复习日期
+        if now is None:
+            now = datetime.now()
+        next_review_date = now + timedelta(days=new_interval)
+
+        return new_easiness_factor, new_interval, new_repetitions, next_review_date
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _sm2_core(quality, easiness_factor, interval, repetitions):
+        """
+        SM-2的纯数值部分
+
+        quality只有0-5、EF和间隔的取值在实践中高度重复，
+        缓存命中时整段浮点运算直接跳过。
+
+        Returns:
+            (new_easiness_factor, new_interval, new_repetitions)
+        """
         # 更新轻松度因子
         # EF' = EF + (0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
         new_easiness_factor = easiness_factor + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
@@ -64,10 +94,7 @@ class SM2Algorithm:
                 # I(n) = I(n-1) * EF
                 new_interval = int(interval * new_easiness_factor)
 
-        # 计算下次复习日期
-        next_review_date = datetime.now() + timedelta(days=new_interval)
-
-        return new_easiness_factor, new_interval, new_repetitions, next_review_date
+        return new_easiness_factor, new_interval, new_repetitions
 
     @staticmethod
     def quality_from_performance(is_correct, time_spent=None):
@@ -101,6 +128,14 @@ class SM2Algorithm:
 class ReviewStrategy:
     """复习策略管理"""
 
+    FIELDNAMES = [
+        'word', 'language', 'total_attempts', 'correct_attempts',
+        'last_review', 'next_review', 'ease_factor', 'interval', 'mastery_level'
+    ]
+
+    # 进程内已确认初始化过的数据目录，后续构造不再逐次stat文件
+    _INITIALIZED_DIRS = set()
+
     def __init__(self, data_dir):
         """
         初始化复习策略
@@ -111,19 +146,122 @@ class ReviewStrategy:
         self.data_dir = data_dir
         self.word_progress_file = os.path.join(data_dir, 'word_progress.csv')
 
+        # 实例被get_review_strategy缓存后会同时被请求线程和后台任务线程使用，
+        # 所有读写都在这把可重入锁里进行
+        self._lock = threading.RLock()
+
+        # 进度数据的内存镜像：行列表 + (word, language)索引，懒加载。
+        # 数据层按项目约定保持CSV文件（不迁SQLite），
+        # 索引让查词从逐行扫描变成O(1)，保存也不再先回读整个文件
+        self._rows = None
+        self._index = None
+        self._rows_mtime = None
+        # 按next_review排序的到期索引，保存后置脏、查询时按需重建
+        self._due_index = None
+        self._due_dirty = True
+
         # 确保文件存在
         self._init_csv_file()
 
     def _init_csv_file(self):
-        """初始化CSV文件"""
+        """初始化CSV文件（每个目录只检查一次）"""
+        if self.data_dir in ReviewStrategy._INITIALIZED_DIRS:
+            return
+
         if not os.path.exists(self.word_progress_file):
             with open(self.word_progress_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=[
-                    'word', 'language', 'total_attempts', 'correct_attempts',
-                    'last_review', 'next_review', 'ease_factor', 'interval', 'mastery_level'
-                ])
+                writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
                 writer.writeheader()
 
+        ReviewStrategy._INITIALIZED_DIRS.add(self.data_dir)
+
+    def _load_rows(self):
+        """
+        把word_progress.csv读进内存并建立(word, language)索引
+
+        以文件mtime做守卫：没变时直接复用已加载的行，
+        文件被其他实例改写过则重新加载。
+        """
+        try:
+            mtime = os.stat(self.word_progress_file).st_mtime_ns
+        except OSError:
+            mtime = None
+
+        if self._rows is not None and mtime == self._rows_mtime:
+            return
+
+        self._rows = []
+        self._index = {}
+        if mtime is not None:
+            with open(self.word_progress_file, 'r', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                for row in reader:
+                    self._rows.append(row)
+                    self._index[(row['word'], row['language'])] = row
+        self._rows_mtime = mtime
+        self._due_dirty = True
+
+    @staticmethod
+    def _review_ts(value):
+        """
+        把next_review/last_review的值转成epoch秒
+
+        新数据直接存整数秒；旧数据是ISO字符串，做一次兼容解析。
+        无法解析时返回None。
+        """
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except (TypeError, ValueError):
+            return None
+
+    def _ensure_due_index(self):
+        """重建（如有必要）按next_review排序的到期索引"""
+        if not self._due_dirty and self._due_index is not None:
+            return
+
+        entries = []
+        for row in self._rows:
+            ts = self._review_ts(row.get('next_review'))
+            if ts is None:
+                continue
+            entries.append((ts, row['word'], row['language']))
+        entries.sort()
+        self._due_index = entries
+        self._due_dirty = False
+
+    def _flush_rows(self):
+        """
+        把内存中的进度行整体写回CSV，并同步mtime守卫
+
+        先写临时文件再os.replace原子替换：中途崩溃或磁盘写满
+        不会留下截断的进度文件，复习历史不丢。
+        """
+        tmp_path = self.word_progress_file + '.tmp'
+        try:
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=self.FIELDNAMES)
+                writer.writeheader()
+                writer.writerows(self._rows)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.word_progress_file)
+        except Exception:
+            # 失败时清掉残留的临时文件，原文件保持原样
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        try:
+            self._rows_mtime = os.stat(self.word_progress_file).st_mtime_ns
+        except OSError:
+            self._rows_mtime = None
+
     def get_words_due_for_review(self, language, limit=5):
         """
         获取今天需要复习的单词
@@ -135,31 +273,26 @@ class ReviewStrategy:
         Returns:
             需要复习的单词列表
         """
-        if not os.path.exists(self.word_progress_file):
-            return []
+        with self._lock:
+            self._load_rows()
+            self._ensure_due_index()
+            return list(itertools.islice(self._iter_due(language, time.time()), limit))
 
-        words_due = []
-        now = datetime.now()
-
-        with open(self.word_progress_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # 只返回指定语言的单词
-                if row['language'] != language:
-                    continue
-
-                # 检查是否到了复习时间
-                try:
-                    next_review = datetime.fromisoformat(row['next_review'])
-                    if next_review <= now:
-                        words_due.append(row)
-                except (ValueError, KeyError):
-                    continue
-
-                if len(words_due) >= limit:
-                    break
+    def _iter_due(self, language, now_ts):
+        """
+        按到期先后惰性产出指定语言的到期单词行
 
-        return words_due
+        Args:
+            language: 语言
+            now_ts: 当前epoch秒
+        """
+        # 到期索引按epoch秒排序，整数比较定位截止点，
+        # 到期条目中最久未复习的排在最前
+        cutoff = bisect.bisect_right(self._due_index, (now_ts, '\uffff', '\uffff'))
+        for _, word, lang in self._due_index[:cutoff]:
+            if lang == language:
+                # 返回副本，调用方改动不会污染内存镜像
+                yield dict(self._index[(word, lang)])
 
     def update_word_progress(self, word, language, is_correct, time_spent=None):
         """
@@ -171,6 +304,15 @@ class ReviewStrategy:
             is_correct: 是否正确
             time_spent: 答题耗时（秒），可选
         """
+        with self._lock:
+            self._update_word_progress_locked(word, language, is_correct, time_spent)
+
+    def _update_word_progress_locked(self, word, language, is_correct, time_spent):
+        """update_word_progress 的实现（调用方已持有锁）"""
+        # 整个更新共用一个now，时间戳以epoch秒存储（比较时无需解析）
+        now = datetime.now()
+        now_ts = int(now.timestamp())
+
         # 读取现有数据
         word_data = self._get_word_data(word, language)
 
@@ -178,7 +320,7 @@ class ReviewStrategy:
             # 新单词
             quality = SM2Algorithm.quality_from_performance(is_correct, time_spent)
             ef, interval, repetitions, next_review = SM2Algorithm.calculate_next_review(
-                quality, 2.5, 0, 0  # 初始EF=2.5
+                quality, 2.5, 0, 0, now=now  # 初始EF=2.5
             )
 
             word_data = {
@@ -186,8 +328,8 @@ class ReviewStrategy:
                 'language': language,
                 'total_attempts': 1,
                 'correct_attempts': 1 if is_correct else 0,
-                'last_review': datetime.now().isoformat(),
-                'next_review': next_review.isoformat(),
+                'last_review': now_ts,
+                'next_review': int(next_review.timestamp()),
                 'ease_factor': ef,
                 'interval': interval,
                 'mastery_level': 1.0 if is_correct else 0.0
@@ -206,14 +348,15 @@ class ReviewStrategy:
                 quality,
                 float(word_data['ease_factor']),
                 int(word_data['interval']),
-                0  # repetitions暂时不存储
+                0,  # repetitions暂时不存储
+                now=now
             )
 
             word_data.update({
                 'total_attempts': total_attempts,
                 'correct_attempts': correct_attempts,
-                'last_review': datetime.now().isoformat(),
-                'next_review': next_review.isoformat(),
+                'last_review': now_ts,
+                'next_review': int(next_review.timestamp()),
                 'ease_factor': ef,
                 'interval': interval,
                 'mastery_level': mastery_level
@@ -233,16 +376,9 @@ class ReviewStrategy:
         Returns:
             单词数据字典，如果不存在则返回None
         """
-        if not os.path.exists(self.word_progress_file):
-            return None
-
-        with open(self.word_progress_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['word'] == word and row['language'] == language:
-                    return row
-
-        return None
+        with self._lock:
+            self._load_rows()
+            return self._index.get((word, language))
 
     def _save_word_data(self, word_data):
         """
@@ -251,33 +387,25 @@ class ReviewStrategy:
         Args:
             word_data: 单词数据字典
         """
-        # 先读取所有数据
-        rows = []
-        updated = False
+        with self._lock:
+            self._save_word_data_locked(word_data)
 
-        if os.path.exists(self.word_progress_file):
-            with open(self.word_progress_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-
-        # 更新或添加数据
-        for i, row in enumerate(rows):
-            if row['word'] == word_data['word'] and row['language'] == word_data['language']:
-                rows[i] = word_data
-                updated = True
-                break
-
-        if not updated:
-            rows.append(word_data)
-
-        # 写回文件
-        with open(self.word_progress_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                'word', 'language', 'total_attempts', 'correct_attempts',
-                'last_review', 'next_review', 'ease_factor', 'interval', 'mastery_level'
-            ])
-            writer.writeheader()
-            writer.writerows(rows)
+    def _save_word_data_locked(self, word_data):
+        """_save_word_data 的实现（调用方已持有锁）"""
+        self._load_rows()
+
+        key = (word_data['word'], word_data['language'])
+        existing = self._index.get(key)
+        if existing is None:
+            self._rows.append(word_data)
+            self._index[key] = word_data
+        elif existing is not word_data:
+            existing.update(word_data)
+
+        self._due_dirty = True
+
+        # 写回文件（索引里就是全量数据，不再先回读一遍CSV）
+        self._flush_rows()
 
     def get_mastery_stats(self, language=None):
         """
@@ -289,34 +417,30 @@ class ReviewStrategy:
         Returns:
             统计数据字典
         """
-        if not os.path.exists(self.word_progress_file):
-            return {
-                'total_words': 0,
-                'mastered_words': 0,
-                'learning_words': 0,
-                'average_mastery': 0.0
-            }
+        with self._lock:
+            return self._get_mastery_stats_locked(language)
+
+    def _get_mastery_stats_locked(self, language):
+        """get_mastery_stats 的实现（调用方已持有锁）"""
+        self._load_rows()
 
         total_words = 0
         mastered_words = 0  # 掌握度 >= 0.8
-        learning_words = 0  # 掌握度 < 0.8
         total_mastery = 0.0
 
-        with open(self.word_progress_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if language and row['language'] != language:
-                    continue
+        # 直接在内存行上单趟聚合，不再重新打开和解析CSV
+        for row in self._rows:
+            if language and row['language'] != language:
+                continue
 
-                total_words += 1
-                mastery = float(row['mastery_level'])
-                total_mastery += mastery
+            total_words += 1
+            mastery = float(row['mastery_level'])
+            total_mastery += mastery
 
-                if mastery >= 0.8:
-                    mastered_words += 1
-                else:
-                    learning_words += 1
+            if mastery >= 0.8:
+                mastered_words += 1
 
+        learning_words = total_words - mastered_words
         average_mastery = total_mastery / total_words if total_words > 0 else 0.0
 
         return {
@@ -328,6 +452,7 @@ class ReviewStrategy:
 
 
 # 创建全局实例
+@lru_cache(maxsize=4)
 def get_review_strategy(data_dir):
-    """获取复习策略实例"""
+    """获取复习策略实例（同一数据目录复用同一实例，行缓存才能跨调用生效）"""
     return ReviewStrategy(data_dir)
@@ -0,0 +1,30 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 - Present Sepine Tam, Inc. All Rights Reserved
+#
+# @Author : Sepine Tam (谭淞)
+# @Email  : sepinetam@gmail.com
+# @File   : wsgi.py
+
+"""
+WSGI入口
+生产环境用多worker的WSGI服务器启动，代替Werkzeug开发服务器：
+
+    uv run gunicorn -w 4 -k gthread --threads 4 wsgi:application
+
+注意：进程内缓存（用户配置、聚合统计）是按worker各自一份的，
+它们都以文件mtime做失效，多worker下依然正确。
+"""
+
+import sys
+import os
+
+# 添加src目录到Python路径
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from app import app, init_csv_files
+
+init_csv_files()
+
+application = app